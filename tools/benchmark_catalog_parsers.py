@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from check_package_availability import (
+    PackageEntry,
+    extract_choco_identifier,
+    extract_manager_identifier,
+    extract_scoop_identifier,
+    extract_winget_identifier,
+    interpret_manager_result,
+    iter_package_files,
+    load_packages,
+    split_command,
+)
+from suggest_catalog_fixes import (
+    SearchCandidate,
+    compute_similarity,
+    parse_winget_output,
+    score_candidates,
+)
+
+# Found/not-found outputs fed to interpret_manager_result. These are
+# hand-written in the shape of each CLI's output; winget-list.txt is the only
+# real capture and drives the winget search parser.
+CAPTURE_FILES = {
+    "winget": ("synthetic-winget-show.txt",
+               "synthetic-winget-show-not-found.txt"),
+    "choco": ("synthetic-choco-search.txt",
+              "synthetic-choco-search-not-found.txt"),
+    "scoop": ("synthetic-scoop-search.txt",
+              "synthetic-scoop-search-not-found.txt"),
+}
+WINGET_LISTING_FILE = "winget-list.txt"
+
+SEARCH_RESULT_WINDOW = 20
+SCORE_ENTRIES = 100
+SIMILARITY_ENTRIES = 50
+
+
+@dataclass(frozen=True)
+class MicroBenchmark:
+    name: str
+    function: Callable[..., object]
+    inputs: Sequence[Tuple[object, ...]]
+
+
+@dataclass(frozen=True)
+class MicroResult:
+    name: str
+    inputs: int
+    ns_per_op: float
+    ns_per_op_min: float
+    peak_bytes_per_op: float
+    rounds: List[float]
+
+
+def parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=
+        "Micro-benchmark the catalog parsers and scorers against the real catalog and CLI captures."
+    )
+    parser.add_argument(
+        "--root",
+        type=Path,
+        default=Path(__file__).resolve().parents[1],
+        help="Repository root (defaults to project root)",
+    )
+    parser.add_argument(
+        "--captures",
+        type=Path,
+        default=None,
+        help="Directory holding CLI output captures (defaults to root/debug).",
+    )
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=5,
+        help="Timed rounds per benchmark; the median is reported (defaults to 5).",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="Minimum seconds per round (defaults to 0.2).",
+    )
+    parser.add_argument(
+        "--filter",
+        default=None,
+        help="Only run benchmarks whose name contains this substring.",
+    )
+    parser.add_argument(
+        "--json",
+        dest="json_path",
+        type=Path,
+        default=None,
+        help="Also write the results as JSON to this path.",
+    )
+    return parser.parse_args(argv)
+
+
+def load_captures(capture_dir: Path) -> Dict[str, Tuple[str, str]]:
+    captures: Dict[str, Tuple[str, str]] = {}
+    for manager, (found, missing) in CAPTURE_FILES.items():
+        captures[manager] = (
+            (capture_dir / found).read_text(encoding="utf-8"),
+            (capture_dir / missing).read_text(encoding="utf-8"),
+        )
+    return captures
+
+
+def load_winget_listing(capture_dir: Path) -> str:
+    return (capture_dir / WINGET_LISTING_FILE).read_text(encoding="utf-8")
+
+
+def build_benchmarks(entries: Sequence[PackageEntry],
+                     captures: Dict[str, Tuple[str, str]],
+                     winget_output: str) -> List[MicroBenchmark]:
+    commands = [(entry.command, ) for entry in entries]
+    by_manager: Dict[str, List[Tuple[object, ...]]] = {
+        "winget": [],
+        "choco": [],
+        "scoop": [],
+    }
+    for entry in entries:
+        manager = entry.manager.lower()
+        manager = "choco" if manager == "chocolatey" else manager
+        if manager in by_manager:
+            by_manager[manager].append((entry.command, ))
+
+    interpret_inputs: List[Tuple[object, ...]] = []
+    for entry in entries:
+        manager = entry.manager.lower()
+        manager = "choco" if manager == "chocolatey" else manager
+        if manager not in captures:
+            continue
+        identifier = extract_manager_identifier(entry) or entry.package_id
+        found, missing = captures[manager]
+        interpret_inputs.append((manager, identifier, 0, found))
+        interpret_inputs.append((manager, identifier, 1, missing))
+
+    candidates: List[SearchCandidate] = parse_winget_output(
+        winget_output, "benchmark")
+    similarity_inputs = [(entry.package_id, candidate.identifier)
+                         for entry in entries[:SIMILARITY_ENTRIES]
+                         for candidate in candidates]
+    # Real searches return a screenful of candidates, so score each entry
+    # against a sliding window of the captured rows rather than all of them.
+    score_inputs = [
+        (entry, extract_manager_identifier(entry),
+         candidates[index % len(candidates):][:SEARCH_RESULT_WINDOW])
+        for index, entry in enumerate(entries[:SCORE_ENTRIES])
+    ]
+
+    return [
+        MicroBenchmark("split_command", split_command, commands),
+        MicroBenchmark("extract_winget_identifier", extract_winget_identifier,
+                       by_manager["winget"]),
+        MicroBenchmark("extract_choco_identifier", extract_choco_identifier,
+                       by_manager["choco"]),
+        MicroBenchmark("extract_scoop_identifier", extract_scoop_identifier,
+                       by_manager["scoop"]),
+        MicroBenchmark("interpret_manager_result", interpret_manager_result,
+                       interpret_inputs),
+        MicroBenchmark("parse_winget_output", parse_winget_output,
+                       [(winget_output, "benchmark")]),
+        MicroBenchmark("compute_similarity", compute_similarity,
+                       similarity_inputs),
+        MicroBenchmark("score_candidates", score_candidates, score_inputs),
+    ]
+
+
+def _run_pass(benchmark: MicroBenchmark, passes: int) -> float:
+    function = benchmark.function
+    inputs = benchmark.inputs
+    started = time.perf_counter_ns()
+    for _ in range(passes):
+        for arguments in inputs:
+            function(*arguments)
+    return time.perf_counter_ns() - started
+
+
+def _peak_bytes_per_op(benchmark: MicroBenchmark) -> float:
+    # tracemalloc cannot count allocations, so report the transient peak a
+    # single call reaches above the memory live before it started.
+    tracemalloc.start()
+    try:
+        total = 0
+        for arguments in benchmark.inputs:
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            benchmark.function(*arguments)
+            _, peak = tracemalloc.get_traced_memory()
+            total += max(0, peak - current)
+    finally:
+        tracemalloc.stop()
+    return total / len(benchmark.inputs)
+
+
+def measure(benchmark: MicroBenchmark, rounds: int,
+            min_time: float) -> MicroResult:
+    operations = len(benchmark.inputs)
+    passes = 1
+    # Calibrate so each round runs for at least min_time.
+    while True:
+        elapsed = _run_pass(benchmark, passes)
+        if elapsed >= min_time * 1e9 or passes >= 1 << 20:
+            break
+        passes *= 2
+    samples = [
+        _run_pass(benchmark, passes) / (passes * operations)
+        for _ in range(rounds)
+    ]
+    return MicroResult(
+        name=benchmark.name,
+        inputs=operations,
+        ns_per_op=statistics.median(samples),
+        ns_per_op_min=min(samples),
+        peak_bytes_per_op=_peak_bytes_per_op(benchmark),
+        rounds=samples,
+    )
+
+
+def render_table(results: Sequence[MicroResult]) -> None:
+    print(f"{'BENCHMARK':<28} {'INPUTS':>7} {'NS/OP':>12} {'MIN NS/OP':>12} "
+          f"{'PEAK B/OP':>10}")
+    for res in results:
+        print(f"{res.name:<28} {res.inputs:>7} {res.ns_per_op:>12.1f} "
+              f"{res.ns_per_op_min:>12.1f} {res.peak_bytes_per_op:>10.1f}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.rounds < 1:
+        print("--rounds must be at least 1.", file=sys.stderr)
+        return 1
+    capture_dir = args.captures or args.root / "debug"
+    try:
+        captures = load_captures(capture_dir)
+        winget_output = load_winget_listing(capture_dir)
+    except OSError as exc:
+        print(f"Failed to read CLI captures: {exc}", file=sys.stderr)
+        return 1
+    entries = load_packages(list(iter_package_files(args.root, "*.yml")))
+    if not entries:
+        print("No catalog entries found.", file=sys.stderr)
+        return 1
+
+    results: List[MicroResult] = []
+    for benchmark in build_benchmarks(entries, captures, winget_output):
+        if args.filter and args.filter not in benchmark.name:
+            continue
+        if not benchmark.inputs:
+            continue
+        results.append(measure(benchmark, args.rounds, args.min_time))
+
+    print(f"{len(entries)} catalog entries, captures from {capture_dir}\n")
+    render_table(results)
+    if args.json_path:
+        payload = {
+            "entries": len(entries),
+            "results": [{
+                "name": res.name,
+                "inputs": res.inputs,
+                "ns_per_op": round(res.ns_per_op, 3),
+                "ns_per_op_min": round(res.ns_per_op_min, 3),
+                "peak_bytes_per_op": round(res.peak_bytes_per_op, 1),
+                "rounds": [round(sample, 3) for sample in res.rounds],
+            } for res in results],
+        }
+        args.json_path.parent.mkdir(parents=True, exist_ok=True)
+        args.json_path.write_text(json.dumps(payload, indent=2) + "\n",
+                                  encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
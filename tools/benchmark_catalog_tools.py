@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+import check_package_availability
+import suggest_catalog_fixes
+from check_package_availability import percentile
+from fake_package_cli import (FakeCliSettings, install_fake_clis,
+                              settings_environment)
+
+# Rough manager mix of the real catalog so per-manager concurrency limits
+# see a representative load.
+MANAGER_MIX = ("winget", "choco", "winget", "choco", "choco", "winget",
+               "choco", "winget", "choco", "scoop")
+
+
+@dataclass
+class BenchmarkResult:
+    tool: str
+    entries: int
+    workers: int
+    samples: List[float] = field(default_factory=list)
+    latencies: List[float] = field(default_factory=list)
+
+    @property
+    def seconds(self) -> float:
+        return statistics.median(self.samples) if self.samples else 0.0
+
+    @property
+    def entries_per_second(self) -> float:
+        return self.entries / self.seconds if self.seconds else 0.0
+
+    def latency(self, percent: float) -> float:
+        if not self.latencies:
+            return 0.0
+        return percentile(sorted(self.latencies), percent)
+
+    def to_record(self) -> Dict[str, object]:
+        record = asdict(self)
+        del record["latencies"]
+        record.update({
+            "seconds": round(self.seconds, 6),
+            "entries_per_second": round(self.entries_per_second, 3),
+            "p50": round(self.latency(50), 6),
+            "p95": round(self.latency(95), 6),
+            "p99": round(self.latency(99), 6),
+            "commands": len(self.latencies),
+        })
+        return record
+
+
+def parse_int_list(value: str) -> List[int]:
+    try:
+        numbers = [int(part) for part in value.split(",") if part.strip()]
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(
+            f"Expected a comma-separated list of integers: {value}") from exc
+    if not numbers or any(number < 1 for number in numbers):
+        raise argparse.ArgumentTypeError(
+            f"Expected positive integers: {value}")
+    return numbers
+
+
+def parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=
+        "Benchmark the catalog tools end to end against offline fake winget/choco/scoop CLIs."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=parse_int_list,
+        default=[100, 500],
+        help="Comma-separated catalog sizes to benchmark (defaults to 100,500).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=parse_int_list,
+        default=[1, 4, 16],
+        help=
+        "Comma-separated --jobs values for check_package_availability.py (defaults to 1,4,16).",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["thread", "asyncio"],
+        default="thread",
+        help="Execution backend passed to check_package_availability.py.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Runs per configuration; the median wall time is reported.",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.05,
+        help="Base latency of each fake CLI call in seconds (defaults to 0.05).",
+    )
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        default=0.02,
+        help="Uniform extra latency added per call in seconds (defaults to 0.02).",
+    )
+    parser.add_argument(
+        "--output-bytes",
+        type=int,
+        default=512,
+        help="Approximate stdout size of each successful call (defaults to 512).",
+    )
+    parser.add_argument(
+        "--failure-ratio",
+        type=float,
+        default=0.02,
+        help="Share of identifiers for which the fake CLI errors out.",
+    )
+    parser.add_argument(
+        "--not-found-ratio",
+        type=float,
+        default=0.1,
+        help="Share of identifiers the fake CLI reports as missing.",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed for fake CLI outcomes and jitter.",
+    )
+    parser.add_argument(
+        "--skip-suggest",
+        action="store_true",
+        help="Only benchmark check_package_availability.py.",
+    )
+    parser.add_argument(
+        "--json",
+        dest="json_path",
+        type=Path,
+        default=None,
+        help="Also write the benchmark results as JSON to this path.",
+    )
+    return parser.parse_args(argv)
+
+
+def write_benchmark_catalog(root: Path, size: int) -> Path:
+    package_dir = root / "data" / "catalog" / "packages"
+    package_dir.mkdir(parents=True, exist_ok=True)
+    lines = ["packages:"]
+    for index in range(size):
+        manager = MANAGER_MIX[index % len(MANAGER_MIX)]
+        if manager == "winget":
+            command = (f"winget install --id Bench.Package{index} -e "
+                       "--accept-package-agreements")
+        elif manager == "choco":
+            command = f"choco install bench-package-{index} -y"
+        else:
+            command = f"scoop install bench-package-{index}"
+        lines.extend([
+            f"    - id: bench-package-{index}",
+            f"      name: Bench Package {index}",
+            f"      manager: {manager}",
+            f'      command: "{command}"',
+            "      tags: [benchmark]",
+        ])
+    path = package_dir / "benchmark.yml"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+@contextlib.contextmanager
+def fake_cli_environment(bin_dir: Path,
+                         settings: FakeCliSettings) -> Iterator[None]:
+    overrides = settings_environment(settings)
+    overrides["PATH"] = os.pathsep.join(
+        [str(bin_dir), os.environ.get("PATH", "")])
+    previous = {name: os.environ.get(name) for name in overrides}
+    os.environ.update(overrides)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def read_span_durations(trace_path: Path) -> List[float]:
+    payload = json.loads(trace_path.read_text(encoding="utf-8"))
+    return [
+        event["dur"] / 1_000_000 for event in payload.get("traceEvents", [])
+        if event.get("ph") == "X"
+    ]
+
+
+def run_quietly(entry_point: Callable[[List[str]], int],
+                argv: List[str]) -> str:
+    stdout = io.StringIO()
+    with contextlib.redirect_stdout(stdout), \
+            contextlib.redirect_stderr(io.StringIO()):
+        entry_point(argv)
+    return stdout.getvalue()
+
+
+def benchmark_check(root: Path, size: int, workers: int, backend: str,
+                    repeat: int, work_dir: Path) -> BenchmarkResult:
+    result = BenchmarkResult("check_package_availability", size, workers)
+    trace_path = work_dir / "check-trace.json"
+    for _ in range(repeat):
+        argv = [
+            "--root",
+            str(root),
+            "--no-cache",
+            "--format",
+            "json",
+            "--jobs",
+            str(workers),
+            "--backend",
+            backend,
+            "--trace-out",
+            str(trace_path),
+        ]
+        started = time.perf_counter()
+        output = run_quietly(check_package_availability.main, argv)
+        result.samples.append(time.perf_counter() - started)
+        result.latencies.extend(read_span_durations(trace_path))
+    (work_dir / "results.json").write_text(output, encoding="utf-8")
+    return result
+
+
+def benchmark_suggest(root: Path, size: int, repeat: int,
+                      work_dir: Path) -> BenchmarkResult:
+    results_path = work_dir / "results.json"
+    failing = [
+        record
+        for record in json.loads(results_path.read_text(encoding="utf-8"))
+        if record.get("status") in ("not-found", "error")
+    ]
+    result = BenchmarkResult("suggest_catalog_fixes", len(failing), 1)
+    trace_path = work_dir / "suggest-trace.json"
+    for _ in range(repeat):
+        argv = [
+            "--root",
+            str(root),
+            "--input",
+            str(results_path),
+            "--output",
+            str(work_dir / "fixes.json"),
+            "--no-stdout",
+            "--trace-out",
+            str(trace_path),
+        ]
+        started = time.perf_counter()
+        run_quietly(suggest_catalog_fixes.main, argv)
+        result.samples.append(time.perf_counter() - started)
+        result.latencies.extend(read_span_durations(trace_path))
+    return result
+
+
+def render_table(results: Sequence[BenchmarkResult]) -> None:
+    print(f"{'TOOL':<28} {'ENTRIES':>8} {'WORKERS':>8} {'SECONDS':>9} "
+          f"{'ENTRIES/S':>10} {'P50':>8} {'P95':>8} {'P99':>8}")
+    for res in results:
+        print(f"{res.tool:<28} {res.entries:>8} {res.workers:>8} "
+              f"{res.seconds:>9.3f} {res.entries_per_second:>10.1f} "
+              f"{res.latency(50):>8.3f} {res.latency(95):>8.3f} "
+              f"{res.latency(99):>8.3f}")
+
+
+def run_benchmarks(args: argparse.Namespace) -> List[BenchmarkResult]:
+    settings = FakeCliSettings(
+        latency=args.latency,
+        jitter=args.jitter,
+        output_bytes=args.output_bytes,
+        failure_ratio=args.failure_ratio,
+        not_found_ratio=args.not_found_ratio,
+        seed=args.seed,
+    )
+    results: List[BenchmarkResult] = []
+    with tempfile.TemporaryDirectory(prefix="catalog-bench-") as temp:
+        temp_dir = Path(temp)
+        bin_dir = temp_dir / "bin"
+        install_fake_clis(bin_dir)
+        with fake_cli_environment(bin_dir, settings):
+            for size in args.sizes:
+                root = temp_dir / f"catalog-{size}"
+                write_benchmark_catalog(root, size)
+                work_dir = temp_dir / f"work-{size}"
+                work_dir.mkdir()
+                for workers in args.workers:
+                    results.append(
+                        benchmark_check(root, size, workers, args.backend,
+                                        args.repeat, work_dir))
+                if not args.skip_suggest:
+                    results.append(
+                        benchmark_suggest(root, size, args.repeat, work_dir))
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.repeat < 1:
+        print("--repeat must be at least 1.", file=sys.stderr)
+        return 1
+
+    results = run_benchmarks(args)
+    render_table(results)
+    if args.json_path:
+        payload = {
+            "settings": {
+                "latency": args.latency,
+                "jitter": args.jitter,
+                "output_bytes": args.output_bytes,
+                "failure_ratio": args.failure_ratio,
+                "not_found_ratio": args.not_found_ratio,
+                "seed": args.seed,
+                "backend": args.backend,
+            },
+            "results": [res.to_record() for res in results],
+        }
+        args.json_path.parent.mkdir(parents=True, exist_ok=True)
+        args.json_path.write_text(json.dumps(payload, indent=2) + "\n",
+                                  encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import collections
+import contextlib
+import json
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Deque, Dict, Iterator, Optional, Sequence, TextIO, Tuple
+
+# A cassette is a JSON Lines file: a header line carrying the format version
+# followed by one interaction per manager command. Interactions are keyed on
+# the logical command (e.g. ["winget", "show", "--id", ...]) rather than the
+# prepared one, so a cassette recorded on Windows, where the executable
+# resolves to a full path or a PowerShell shim, replays anywhere.
+
+CASSETTE_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Interaction:
+    command: Tuple[str, ...]
+    stdout: str
+    stderr: str
+    return_code: Optional[int]
+    latency: float
+    timed_out: bool = False
+
+
+class CassetteMiss(LookupError):
+    pass
+
+
+class Cassette:
+
+    def __init__(self,
+                 path: Path,
+                 mode: str,
+                 replay_latency: bool = False) -> None:
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.replay_latency = replay_latency
+        self.recorded = 0
+        self.replayed = 0
+        self._lock = threading.Lock()
+        self._handle: Optional[TextIO] = None
+        self._interactions: Dict[Tuple[str, ...],
+                                 Deque[Interaction]] = collections.defaultdict(
+                                     collections.deque)
+        if mode == "record":
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = path.open("w", encoding="utf-8", newline="\n")
+            self._handle.write(json.dumps({"version": CASSETTE_VERSION}) + "\n")
+        else:
+            self._load()
+
+    def _load(self) -> None:
+        with self.path.open(encoding="utf-8") as handle:
+            header = json.loads(handle.readline() or "{}")
+            version = header.get("version")
+            if version != CASSETTE_VERSION:
+                raise ValueError(f"{self.path} has cassette version {version}; "
+                                 f"expected {CASSETTE_VERSION}.")
+            for line in handle:
+                if not line.strip():
+                    continue
+                raw = json.loads(line)
+                interaction = Interaction(
+                    command=tuple(raw["command"]),
+                    stdout=raw.get("stdout", ""),
+                    stderr=raw.get("stderr", ""),
+                    return_code=raw.get("return_code"),
+                    latency=float(raw.get("latency", 0.0)),
+                    timed_out=bool(raw.get("timed_out", False)),
+                )
+                self._interactions[interaction.command].append(interaction)
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def record(self,
+               command: Sequence[str],
+               stdout: str,
+               stderr: str,
+               return_code: Optional[int],
+               latency: float,
+               timed_out: bool = False) -> None:
+        interaction = Interaction(tuple(command), stdout, stderr, return_code,
+                                  round(latency, 6), timed_out)
+        line = json.dumps(asdict(interaction), ensure_ascii=False)
+        with self._lock:
+            if self._handle is None:
+                raise ValueError("Cassette is not open for recording.")
+            self._handle.write(line + "\n")
+            self._handle.flush()
+            self.recorded += 1
+
+    def replay(self, command: Sequence[str]) -> Interaction:
+        key = tuple(command)
+        with self._lock:
+            queue = self._interactions.get(key)
+            if not queue:
+                raise CassetteMiss(
+                    f"No recorded interaction for '{' '.join(key)}'.")
+            # Repeated commands (retries, duplicate searches) are served in
+            # recording order; the last one keeps answering once exhausted.
+            interaction = queue.popleft() if len(queue) > 1 else queue[0]
+            self.replayed += 1
+        return interaction
+
+    def delay(self, interaction: Interaction) -> float:
+        return interaction.latency if self.replay_latency else 0.0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+
+_active_cassette: Optional[Cassette] = None
+
+
+def recording_cassette() -> Optional[Cassette]:
+    cassette = _active_cassette
+    return cassette if cassette is not None and cassette.recording else None
+
+
+def replaying_cassette() -> Optional[Cassette]:
+    cassette = _active_cassette
+    return cassette if cassette is not None and cassette.replaying else None
+
+
+def open_cassette(record_path: Optional[Path],
+                  replay_path: Optional[Path],
+                  replay_latency: bool = False) -> Optional[Cassette]:
+    if record_path is not None:
+        return Cassette(record_path, "record")
+    if replay_path is not None:
+        return Cassette(replay_path, "replay", replay_latency)
+    return None
+
+
+@contextlib.contextmanager
+def using_cassette(cassette: Optional[Cassette]) -> Iterator[None]:
+    global _active_cassette
+    if cassette is None:
+        yield
+        return
+    _active_cassette = cassette
+    try:
+        yield
+    finally:
+        _active_cassette = None
+        cassette.close()
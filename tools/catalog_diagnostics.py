@@ -0,0 +1,356 @@
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import (ContextManager, Dict, Iterator, List, Optional, Set,
+                    TextIO, Tuple)
+
+PROFILE_PHASES = ("load", "extraction", "subprocess", "scoring", "render")
+
+
+def write_text_atomic(path: Path, text: str) -> None:
+    # Readers such as the node-exporter textfile collector must never see a
+    # half-written file, so write next to the target and rename over it.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=str(path.parent),
+                                     prefix=f".{path.name}.",
+                                     suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as handle:
+            handle.write(text)
+        os.replace(temp_name, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(temp_name)
+        raise
+
+
+class PhaseTimer:
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.totals: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.totals[name] = self.totals.get(name, 0.0) + elapsed
+                self.calls[name] = self.calls.get(name, 0) + 1
+
+    def report(self) -> str:
+        wall = time.perf_counter() - self.started
+        names: List[str] = list(PROFILE_PHASES)
+        names.extend(sorted(name for name in self.totals if name not in names))
+        lines = [f"{'PHASE':<12} {'CALLS':>8} {'SECONDS':>10} {'% WALL':>8}"]
+        for name in names:
+            total = self.totals.get(name, 0.0)
+            share = 100 * total / wall if wall else 0.0
+            lines.append(f"{name:<12} {self.calls.get(name, 0):>8} "
+                         f"{total:>10.3f} {share:>7.1f}%")
+        lines.append(f"{'wall':<12} {'':>8} {wall:>10.3f}")
+        # Phases that run on worker threads add up across workers, so with
+        # --jobs > 1 they can exceed the wall clock.
+        return "\n".join(lines)
+
+
+_active_timer: Optional[PhaseTimer] = None
+
+
+def phase(name: str) -> ContextManager[None]:
+    timer = _active_timer
+    if timer is None:
+        return contextlib.nullcontext()
+    return timer.phase(name)
+
+
+@contextlib.contextmanager
+def profiling(
+        path: Optional[Path],
+        stream: Optional[TextIO] = None) -> Iterator[Optional[PhaseTimer]]:
+    global _active_timer
+    if path is None:
+        yield None
+        return
+
+    stream = stream or sys.stderr
+    timer = PhaseTimer()
+    profiler = cProfile.Profile()
+    _active_timer = timer
+    profiler.enable()
+    try:
+        yield timer
+    finally:
+        profiler.disable()
+        _active_timer = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(str(path))
+        except OSError as exc:
+            print(f"Failed to write profile: {exc}", file=stream)
+        else:
+            print(f"\nProfile written to {path} (inspect with python -m pstats)",
+                  file=stream)
+        print("\nPhase breakdown:", file=stream)
+        print(timer.report(), file=stream)
+
+
+class TraceRecorder:
+
+    def __init__(self) -> None:
+        self.origin = time.perf_counter()
+        self.events: List[Dict[str, object]] = []
+        self._groups: Dict[str, int] = {}
+        self._busy: Dict[str, Set[int]] = {}
+        self._lanes: Set[Tuple[str, int]] = set()
+        self._lock = threading.Lock()
+
+    def _acquire_lane(self, group: str) -> Tuple[int, int]:
+        with self._lock:
+            pid = self._groups.setdefault(group, len(self._groups) + 1)
+            busy = self._busy.setdefault(group, set())
+            lane = 1
+            while lane in busy:
+                lane += 1
+            busy.add(lane)
+            self._lanes.add((group, lane))
+            return pid, lane
+
+    def _microseconds(self, moment: float) -> float:
+        return round((moment - self.origin) * 1_000_000, 3)
+
+    @contextlib.contextmanager
+    def span(self, name: str, group: str,
+             tags: Dict[str, object]) -> Iterator[Dict[str, object]]:
+        # Each group (package manager) becomes a Perfetto process and each
+        # concurrently running span gets the lowest free lane, so overlap
+        # and idle gaps show up directly as tracks.
+        pid, lane = self._acquire_lane(group)
+        started = time.perf_counter()
+        try:
+            yield tags
+        finally:
+            finished = time.perf_counter()
+            event = {
+                "name": name,
+                "cat": group,
+                "ph": "X",
+                "ts": self._microseconds(started),
+                "dur": round((finished - started) * 1_000_000, 3),
+                "pid": pid,
+                "tid": lane,
+                "args": dict(tags),
+            }
+            with self._lock:
+                self.events.append(event)
+                self._busy[group].discard(lane)
+
+    def trace_events(self) -> List[Dict[str, object]]:
+        with self._lock:
+            metadata: List[Dict[str, object]] = []
+            for group, pid in self._groups.items():
+                metadata.append({
+                    "name": "process_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "args": {
+                        "name": group
+                    },
+                })
+            for group, lane in sorted(self._lanes):
+                metadata.append({
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": self._groups[group],
+                    "tid": lane,
+                    "args": {
+                        "name": f"{group} slot {lane}"
+                    },
+                })
+            events = sorted(self.events, key=lambda event: event["ts"])
+        return metadata + events
+
+    def write(self, path: Path) -> None:
+        payload = {"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}
+        write_text_atomic(path, json.dumps(payload) + "\n")
+
+
+_active_trace: Optional[TraceRecorder] = None
+
+
+def trace_span(name: str, group: str,
+               **tags: object) -> ContextManager[Dict[str, object]]:
+    recorder = _active_trace
+    if recorder is None:
+        return contextlib.nullcontext(tags)
+    return recorder.span(name, group, tags)
+
+
+@contextlib.contextmanager
+def tracing(
+        path: Optional[Path],
+        stream: Optional[TextIO] = None) -> Iterator[Optional[TraceRecorder]]:
+    global _active_trace
+    if path is None:
+        yield None
+        return
+
+    stream = stream or sys.stderr
+    recorder = TraceRecorder()
+    _active_trace = recorder
+    try:
+        yield recorder
+    finally:
+        _active_trace = None
+        try:
+            recorder.write(path)
+        except OSError as exc:
+            print(f"Failed to write trace: {exc}", file=stream)
+        else:
+            print(f"Trace with {len(recorder.events)} spans written to {path}",
+                  file=stream)
+
+
+def peak_rss_bytes() -> Optional[int]:
+    if sys.platform.startswith("win"):
+        return _windows_peak_rss_bytes()
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _windows_peak_rss_bytes() -> Optional[int]:
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    try:
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        ok = ctypes.windll.psapi.GetProcessMemoryInfo(process,
+                                                      ctypes.byref(counters),
+                                                      counters.cb)
+    except (AttributeError, OSError):
+        return None
+    return int(counters.PeakWorkingSetSize) if ok else None
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+class MemoryReporter:
+
+    def __init__(self, top: int = 10) -> None:
+        self.top = top
+        self.sections: List[str] = []
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        self._filters = (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        )
+
+    def checkpoint(self, label: str) -> None:
+        snapshot = tracemalloc.take_snapshot().filter_traces(self._filters)
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [
+            f"after {label}: traced {format_bytes(current)}, "
+            f"traced peak {format_bytes(peak)}"
+        ]
+        if self._previous is None:
+            stats = [(stat.size, stat.size, stat.count, stat.traceback)
+                     for stat in snapshot.statistics("lineno")]
+        else:
+            stats = [(stat.size, stat.size_diff, stat.count, stat.traceback)
+                     for stat in snapshot.compare_to(self._previous, "lineno")]
+        stats.sort(key=lambda item: item[0], reverse=True)
+        for size, growth, count, traceback in stats[:self.top]:
+            frame = traceback[0]
+            lines.append(f"  {format_bytes(size):>10} "
+                         f"({'+' if growth >= 0 else '-'}"
+                         f"{format_bytes(abs(growth))}) {count:>8} blocks  "
+                         f"{frame.filename}:{frame.lineno}")
+        self.sections.append("\n".join(lines))
+        self._previous = snapshot
+
+    def report(self) -> str:
+        lines = list(self.sections)
+        rss = peak_rss_bytes()
+        lines.append("peak RSS: " +
+                     (format_bytes(rss) if rss is not None else "unavailable"))
+        return "\n".join(lines)
+
+
+_active_memory: Optional[MemoryReporter] = None
+
+
+def memory_checkpoint(label: str) -> None:
+    reporter = _active_memory
+    if reporter is not None:
+        reporter.checkpoint(label)
+
+
+@contextlib.contextmanager
+def memory_report(enabled: bool,
+                  stream: Optional[TextIO] = None,
+                  top: int = 10) -> Iterator[Optional[MemoryReporter]]:
+    global _active_memory
+    if not enabled:
+        yield None
+        return
+
+    stream = stream or sys.stderr
+    reporter = MemoryReporter(top)
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    _active_memory = reporter
+    try:
+        yield reporter
+    finally:
+        _active_memory = None
+        print("\nMemory report (top allocation sites, growth since the "
+              "previous checkpoint):",
+              file=stream)
+        print(reporter.report(), file=stream)
+        if not already_tracing:
+            tracemalloc.stop()
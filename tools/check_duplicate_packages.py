@@ -8,6 +8,9 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import DefaultDict, Iterable, List, Optional
 
+from catalog_diagnostics import (memory_checkpoint, memory_report, phase,
+                                 profiling)
+
 try:  # Optional dependency; fall back to lightweight parser if unavailable.
     import yaml  # type: ignore
 except ModuleNotFoundError:  # pragma: no cover - exercised only without PyYAML
@@ -47,7 +50,8 @@ def collect_duplicates(
     occurrences: DefaultDict[
         str, List[PackageOccurrence]] = collections.defaultdict(list)
     for package_file in package_files:
-        ids = read_package_ids(package_file)
+        with phase("load"):
+            ids = read_package_ids(package_file)
         for index, package_id in enumerate(ids, start=1):
             occurrences[package_id].append(
                 PackageOccurrence(package_id, package_file, index))
@@ -70,8 +74,12 @@ def format_report(
     for package_id in sorted(duplicates):
         lines.append(f"{package_id} ({len(duplicates[package_id])}x)")
         for occ in duplicates[package_id]:
-            relative = occ.file_path.relative_to(
-                Path.cwd()) if occ.file_path.is_absolute() else occ.file_path
+            relative = occ.file_path
+            if occ.file_path.is_absolute():
+                try:
+                    relative = occ.file_path.relative_to(Path.cwd())
+                except ValueError:
+                    pass
             lines.append(f"  - {relative} [entry #{occ.index}]")
     return "\n".join(lines)
 
@@ -90,7 +98,25 @@ def main(argv: Optional[List[str]] = None) -> int:
         "--strict",
         action="store_true",
         help="Exit with non-zero status when duplicates are found")
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="PATH",
+        help=
+        "Write a cProfile dump to PATH and print a per-phase timing breakdown to stderr."
+    )
+    parser.add_argument(
+        "--memory-report",
+        action="store_true",
+        help=
+        "Trace allocations and print the top allocation sites and peak RSS to stderr."
+    )
     args = parser.parse_args(argv)
+    with profiling(args.profile), memory_report(args.memory_report):
+        return report_duplicates(args)
+
+
+def report_duplicates(args: argparse.Namespace) -> int:
 
     package_files = list(iter_package_files(args.root, args.glob))
     if not package_files:
@@ -98,12 +124,15 @@ def main(argv: Optional[List[str]] = None) -> int:
         return 1
 
     duplicates = collect_duplicates(package_files)
+    memory_checkpoint("load")
     if not duplicates:
         print("No duplicate package IDs detected.")
         return 0
 
-    print("Duplicate package IDs detected:\n")
-    print(format_report(duplicates))
+    with phase("render"):
+        print("Duplicate package IDs detected:\n")
+        print(format_report(duplicates))
+    memory_checkpoint("rendering")
 
     return 1 if args.strict else 0
 
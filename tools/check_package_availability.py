@@ -2,17 +2,40 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import base64
 import collections
+import hashlib
 import json
+import math
 import os
+import queue
 import re
 import shlex
 import shutil
+import sqlite3
 import subprocess
 import sys
-from dataclasses import dataclass
-from pathlib import Path
-from typing import Iterable, List, Optional, Sequence, Tuple
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import xml.etree.ElementTree as ElementTree
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path, PurePosixPath
+from typing import (Callable, ContextManager, Deque, Dict, Iterable, List,
+                    Optional, Sequence, Set, TextIO, Tuple, Union)
+
+from catalog_cassette import (Cassette, CassetteMiss, Interaction,
+                              open_cassette, recording_cassette,
+                              replaying_cassette, using_cassette)
+from catalog_diagnostics import (memory_checkpoint, memory_report, phase,
+                                 profiling, trace_span, tracing,
+                                 write_text_atomic)
 
 try:
     import yaml  # type: ignore
@@ -50,6 +73,60 @@ CLI_NAME_BY_MANAGER = {
     "scoop": "scoop",
 }
 
+# Starting concurrency per manager CLI. winget serialises on its local source
+# database, so it starts low; choco searches are network bound and scale out.
+DEFAULT_MANAGER_CONCURRENCY = {
+    "winget": 2,
+    "choco": 4,
+    "scoop": 2,
+}
+
+
+def _default_cache_dir() -> Path:
+    if sys.platform.startswith("win") and os.environ.get("LOCALAPPDATA"):
+        return Path(os.environ["LOCALAPPDATA"]) / "TidyWindow" / "catalog-tools"
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "tidywindow" / "catalog-tools"
+
+
+def _default_scoop_buckets_dir() -> Path:
+    scoop_root = os.environ.get("SCOOP") or str(Path.home() / "scoop")
+    return Path(scoop_root) / "buckets"
+
+
+DEFAULT_CACHE_DIR = _default_cache_dir()
+
+SCOOP_INDEX_CACHE_VERSION = 1
+
+CACHEABLE_STATUSES = ("ok", "not-found")
+
+FINGERPRINT_MANIFEST_VERSION = 1
+
+RUN_HISTORY_VERSION = 1
+
+HISTORY_STATUSES = ("ok", "not-found", "error")
+
+STABLE_OK_STREAK = 3
+
+PREFLIGHT_COMMANDS = {
+    "winget": ["winget", "--version"],
+    "choco": ["choco", "--version"],
+    "scoop": ["scoop", "--version"],
+}
+
+FAILURE_STATUSES = ("not-found", "error", "unavailable")
+
+SUMMARY_STATUSES = ("ok", "not-found", "error", "unavailable", "skipped",
+                    "deferred")
+
+METRIC_PREFIX = "tidywindow_catalog"
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 60.0)
+
+DEFAULT_CHOCO_FEED = "https://community.chocolatey.org/api/v2/"
+
+ATOM_NAMESPACE = "{http://www.w3.org/2005/Atom}"
+ODATA_NAMESPACE = "{http://schemas.microsoft.com/ado/2007/08/dataservices}"
+
 
 def _find_windows_shim(executable: str) -> Optional[Tuple[str, str]]:
     path_env = os.environ.get("PATH", "")
@@ -98,6 +175,209 @@ def _prepare_command(command: Sequence[str]) -> List[str]:
     return list(command)
 
 
+def find_powershell_shim(executable: str) -> Optional[str]:
+    if shutil.which(executable) or not sys.platform.startswith("win"):
+        return None
+    shim = _find_windows_shim(executable)
+    if shim and shim[1] == ".ps1":
+        return shim[0]
+    return None
+
+
+# Requests and responses are single JSON lines; responses carry a prefix so
+# stray console output from the host or the shims can be told apart.
+POWERSHELL_HOST_FRAME_PREFIX = "@@TIDYWINDOW-HOST@@ "
+
+POWERSHELL_HOST_BOOTSTRAP = r"""
+$ErrorActionPreference = 'Continue'
+$ProgressPreference = 'SilentlyContinue'
+[Console]::OutputEncoding = [System.Text.Encoding]::UTF8
+$prefix = '@@TIDYWINDOW-HOST@@ '
+while ($true) {
+    $line = [Console]::In.ReadLine()
+    if ($null -eq $line) { break }
+    if (-not $line.Trim()) { continue }
+    $request = $line | ConvertFrom-Json
+    $arguments = @($request.arguments)
+    $global:LASTEXITCODE = 0
+    try {
+        $output = & $request.script @arguments *>&1 | Out-String -Width 4096
+        $exitCode = $global:LASTEXITCODE
+    } catch {
+        $output = $_ | Out-String -Width 4096
+        $exitCode = 1
+    }
+    if ($null -eq $exitCode) { $exitCode = 0 }
+    $response = [ordered]@{
+        id = $request.id
+        exitCode = [int]$exitCode
+        output = [string]$output
+    } | ConvertTo-Json -Compress
+    [Console]::Out.WriteLine($prefix + $response)
+    [Console]::Out.Flush()
+}
+"""
+
+
+def default_powershell_host_command() -> Optional[List[str]]:
+    shell = shutil.which("pwsh") or shutil.which("powershell")
+    if not shell:
+        return None
+    encoded = base64.b64encode(
+        POWERSHELL_HOST_BOOTSTRAP.encode("utf-16-le")).decode("ascii")
+    return [
+        shell,
+        "-NoLogo",
+        "-NoProfile",
+        "-NonInteractive",
+        "-ExecutionPolicy",
+        "Bypass",
+        "-EncodedCommand",
+        encoded,
+    ]
+
+
+class PowerShellHostError(RuntimeError):
+    pass
+
+
+class PowerShellHost:
+
+    def __init__(self, command: Sequence[str]) -> None:
+        self.command = list(command)
+        self.process: Optional[subprocess.Popen] = None
+        self._responses: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._next_id = 0
+
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def start(self) -> None:
+        self.stop()
+        self.process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+        )
+        # Each host gets a fresh queue so frames from a killed host can never
+        # be mistaken for answers from its replacement.
+        responses: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._responses = responses
+        threading.Thread(target=self._read_frames,
+                         args=(self.process, responses),
+                         name="powershell-host-reader",
+                         daemon=True).start()
+
+    @staticmethod
+    def _read_frames(process: subprocess.Popen,
+                     responses: "queue.Queue[Optional[str]]") -> None:
+        assert process.stdout is not None
+        for line in process.stdout:
+            if line.startswith(POWERSHELL_HOST_FRAME_PREFIX):
+                responses.put(line[len(POWERSHELL_HOST_FRAME_PREFIX):])
+        responses.put(None)
+
+    def stop(self) -> None:
+        process, self.process = self.process, None
+        if process is None:
+            return
+        if process.poll() is None:
+            process.kill()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+        for stream in (process.stdin, process.stdout):
+            if stream:
+                try:
+                    stream.close()
+                except OSError:
+                    pass
+
+    def run(self, script: str, arguments: Sequence[str],
+            timeout: float) -> Tuple[int, str]:
+        try:
+            return self._run_once(script, arguments, timeout)
+        except PowerShellHostError:
+            # The host died rather than the command failing; replay the
+            # request once on a fresh host before reporting it.
+            return self._run_once(script, arguments, timeout)
+
+    def _run_once(self, script: str, arguments: Sequence[str],
+                  timeout: float) -> Tuple[int, str]:
+        if not self.alive():
+            self.start()
+        assert self.process is not None and self.process.stdin is not None
+        self._next_id += 1
+        request_id = self._next_id
+        request = {
+            "id": request_id,
+            "script": script,
+            "arguments": list(arguments),
+        }
+        try:
+            self.process.stdin.write(json.dumps(request) + "\n")
+            self.process.stdin.flush()
+        except OSError as exc:
+            self.stop()
+            raise PowerShellHostError(
+                f"PowerShell host rejected the request: {exc}") from exc
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                frame = self._responses.get(timeout=max(0.0, remaining))
+            except queue.Empty:
+                # The session may be wedged inside the command; recycle it.
+                self.stop()
+                raise subprocess.TimeoutExpired(self.command, timeout)
+            if frame is None:
+                self.stop()
+                raise PowerShellHostError(
+                    "PowerShell host exited while running the command.")
+            try:
+                response = json.loads(frame)
+            except ValueError:
+                continue
+            if response.get("id") != request_id:
+                continue
+            return int(response.get("exitCode") or 0), str(
+                response.get("output") or "")
+
+
+class PowerShellHostPool:
+
+    def __init__(
+        self,
+        size: int,
+        command: Sequence[str],
+        resolve_script: Callable[[str], Optional[str]] = find_powershell_shim
+    ) -> None:
+        self.resolve_script = resolve_script
+        self._idle: "queue.Queue[PowerShellHost]" = queue.Queue()
+        self._hosts = [PowerShellHost(command) for _ in range(max(1, size))]
+        for host in self._hosts:
+            self._idle.put(host)
+
+    def run(self, script: str, arguments: Sequence[str],
+            timeout: float) -> Tuple[int, str]:
+        host = self._idle.get()
+        try:
+            return host.run(script, arguments, timeout)
+        finally:
+            self._idle.put(host)
+
+    def close(self) -> None:
+        for host in self._hosts:
+            host.stop()
+
+
 @dataclass(frozen=True)
 class PackageEntry:
     package_id: str
@@ -106,6 +386,17 @@ class PackageEntry:
     name: str
     file_path: Path
     index: int
+    buckets: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class CheckTimings:
+    resolve_seconds: float = 0.0
+    spawn_seconds: float = 0.0
+    total_seconds: float = 0.0
+    output_bytes: int = 0
+    timeouts: int = 0
+    retries: int = 0
 
 
 @dataclass(frozen=True)
@@ -115,6 +406,9 @@ class CheckResult:
     status: str
     message: str
     return_code: Optional[int]
+    cached: bool = False
+    coalesced: bool = False
+    timings: Optional[CheckTimings] = None
 
 
 def iter_package_files(root: Path, glob: str) -> Sequence[Path]:
@@ -127,26 +421,40 @@ def iter_package_files(root: Path, glob: str) -> Sequence[Path]:
 def load_packages(files: Sequence[Path]) -> List[PackageEntry]:
     entries: List[PackageEntry] = []
     for file_path in files:
-        raw = yaml.safe_load(file_path.read_text(encoding="utf-8")) or {}
-        packages = raw.get("packages", [])
-        for idx, pkg in enumerate(packages, start=1):
-            if not isinstance(pkg, dict):
-                continue
-            package_id = str(pkg.get("id", "")).strip()
-            manager = str(pkg.get("manager", "")).strip()
-            command = str(pkg.get("command", "")).strip()
-            name = str(pkg.get("name", "")).strip()
-            if not package_id or not manager:
-                continue
-            entries.append(
-                PackageEntry(
-                    package_id=package_id,
-                    manager=manager,
-                    command=command,
-                    name=name,
-                    file_path=file_path,
-                    index=idx,
-                ))
+        entries.extend(
+            parse_packages(file_path.read_text(encoding="utf-8"), file_path))
+    return entries
+
+
+def parse_packages(text: str, file_path: Path) -> List[PackageEntry]:
+    entries: List[PackageEntry] = []
+    raw = yaml.safe_load(text) or {}
+    packages = raw.get("packages", [])
+    for idx, pkg in enumerate(packages, start=1):
+        if not isinstance(pkg, dict):
+            continue
+        package_id = str(pkg.get("id", "")).strip()
+        manager = str(pkg.get("manager", "")).strip()
+        command = str(pkg.get("command", "")).strip()
+        name = str(pkg.get("name", "")).strip()
+        raw_buckets = pkg.get("buckets") or []
+        if isinstance(raw_buckets, str):
+            raw_buckets = [raw_buckets]
+        buckets = tuple(
+            str(bucket).strip() for bucket in raw_buckets
+            if str(bucket).strip())
+        if not package_id or not manager:
+            continue
+        entries.append(
+            PackageEntry(
+                package_id=package_id,
+                manager=manager,
+                command=command,
+                name=name,
+                file_path=file_path,
+                index=idx,
+                buckets=buckets,
+            ))
     return entries
 
 
@@ -171,6 +479,11 @@ def extract_manager_identifier(entry: PackageEntry) -> Optional[str]:
     return None
 
 
+def manager_key(entry: PackageEntry) -> str:
+    manager = entry.manager.lower()
+    return CLI_NAME_BY_MANAGER.get(manager, manager)
+
+
 def extract_winget_identifier(command: str) -> Optional[str]:
     if not command:
         return None
@@ -328,7 +641,22 @@ def summarize_output(output: str, limit: int = 200) -> str:
     return snippet[:limit].rstrip() + "..."
 
 
-def check_package(entry: PackageEntry, timeout: int) -> CheckResult:
+# A gate may answer for an entry without running it (open breaker, spent
+# time budget); an observer sees each real check with its wall time.
+CheckGate = Callable[[PackageEntry], Optional[CheckResult]]
+CheckObserver = Callable[[PackageEntry, CheckResult, float], None]
+
+
+@dataclass(frozen=True)
+class CheckPlan:
+    entry: PackageEntry
+    manager_identifier: str
+    cli_name: str
+    command: List[str]
+    raw_command: Tuple[str, ...] = ()
+
+
+def plan_check(entry: PackageEntry) -> Union[CheckPlan, CheckResult]:
     manager_identifier = extract_manager_identifier(entry)
     if not manager_identifier:
         return CheckResult(
@@ -348,38 +676,1112 @@ def check_package(entry: PackageEntry, timeout: int) -> CheckResult:
         return CheckResult(entry, manager_identifier, "skipped", str(exc),
                            None)
 
-    prepared = _prepare_command(command)
+    return CheckPlan(entry, manager_identifier, cli_name,
+                     _prepare_command(command), tuple(command))
 
+
+def start_failure_result(plan: CheckPlan) -> CheckResult:
+    return CheckResult(
+        plan.entry, plan.manager_identifier, "error",
+        f"Failed to start '{plan.cli_name}'. Ensure it is installed.", None)
+
+
+def timeout_result(plan: CheckPlan, timeout: int) -> CheckResult:
+    return CheckResult(
+        plan.entry, plan.manager_identifier, "error",
+        f"Verification command exceeded the {timeout}s timeout.", None)
+
+
+def complete_check(plan: CheckPlan, return_code: int,
+                   combined_output: str) -> CheckResult:
+    status, message = interpret_manager_result(plan.entry.manager,
+                                               plan.manager_identifier,
+                                               return_code, combined_output)
+    return CheckResult(plan.entry, plan.manager_identifier, status, message,
+                       return_code)
+
+
+def _trace_check(plan: CheckPlan,
+                 attempt: int) -> ContextManager[Dict[str, object]]:
+    return trace_span(plan.entry.package_id,
+                      plan.cli_name,
+                      manager=plan.cli_name,
+                      identifier=plan.manager_identifier,
+                      package=plan.entry.package_id,
+                      attempt=attempt)
+
+
+def _check_in_shell_host(
+        plan: CheckPlan, shell_pool: PowerShellHostPool, script: str,
+        timeout: int) -> Tuple[Optional[CheckResult], float, int]:
+    cassette = recording_cassette()
+    started = time.perf_counter()
     try:
-        completed = subprocess.run(
-            prepared,
-            capture_output=True,
+        return_code, output = shell_pool.run(script, plan.raw_command[1:],
+                                             timeout)
+    except subprocess.TimeoutExpired:
+        if cassette:
+            cassette.record(plan.raw_command, "", "", None,
+                            time.perf_counter() - started, timed_out=True)
+        return None, 0.0, 0
+    except (PowerShellHostError, OSError) as exc:
+        return CheckResult(plan.entry, plan.manager_identifier, "error",
+                           str(exc), None), 0.0, 0
+    if cassette:
+        cassette.record(plan.raw_command, output, "", return_code,
+                        time.perf_counter() - started)
+    result = complete_check(plan, return_code, output)
+    return result, 0.0, len(output.encode("utf-8"))
+
+
+def _run_check_process(
+        plan: CheckPlan,
+        timeout: int) -> Tuple[Optional[CheckResult], float, int]:
+    # Returns (result, spawn seconds, output bytes); result is None when the
+    # command timed out so the caller can decide whether to retry.
+    spawn_started = time.perf_counter()
+    try:
+        process = subprocess.Popen(
+            plan.command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True,
             encoding="utf-8",
             errors="replace",
-            timeout=timeout,
-            check=False,
         )
     except FileNotFoundError:
-        return CheckResult(
-            entry, manager_identifier, "error",
-            f"Failed to start '{cli_name}'. Ensure it is installed.", None)
+        spawn_seconds = time.perf_counter() - spawn_started
+        return start_failure_result(plan), spawn_seconds, 0
+    spawn_seconds = time.perf_counter() - spawn_started
+    cassette = recording_cassette()
+    try:
+        stdout, stderr = process.communicate(timeout=timeout)
     except subprocess.TimeoutExpired:
+        process.kill()
+        process.communicate()
+        if cassette:
+            cassette.record(plan.raw_command, "", "", None,
+                            time.perf_counter() - spawn_started, timed_out=True)
+        return None, spawn_seconds, 0
+    if cassette:
+        cassette.record(plan.raw_command, stdout or "", stderr or "",
+                        process.returncode, time.perf_counter() - spawn_started)
+    combined_output = (stdout or "") + (stderr or "")
+    output_bytes = len(combined_output.encode("utf-8"))
+    result = complete_check(plan, process.returncode, combined_output)
+    return result, spawn_seconds, output_bytes
+
+
+def _replayed_check(
+        plan: CheckPlan,
+        interaction: Interaction) -> Tuple[Optional[CheckResult], float, int]:
+    if interaction.timed_out:
+        return None, 0.0, 0
+    output = interaction.stdout + interaction.stderr
+    return_code = interaction.return_code
+    if return_code is None:
+        return_code = -1
+    result = complete_check(plan, return_code, output)
+    return result, 0.0, len(output.encode("utf-8"))
+
+
+def _cassette_miss_result(plan: CheckPlan, exc: CassetteMiss) -> CheckResult:
+    return CheckResult(plan.entry, plan.manager_identifier, "error", str(exc),
+                       None)
+
+
+def _replay_check(
+        plan: CheckPlan,
+        cassette: Cassette) -> Tuple[Optional[CheckResult], float, int]:
+    try:
+        interaction = cassette.replay(plan.raw_command)
+    except CassetteMiss as exc:
+        return _cassette_miss_result(plan, exc), 0.0, 0
+    delay = cassette.delay(interaction)
+    if delay:
+        time.sleep(delay)
+    return _replayed_check(plan, interaction)
+
+
+def check_package(entry: PackageEntry,
+                  timeout: int,
+                  shell_pool: Optional[PowerShellHostPool] = None,
+                  retries: int = 0) -> CheckResult:
+    started = time.perf_counter()
+    with phase("extraction"):
+        plan = plan_check(entry)
+    resolve_seconds = time.perf_counter() - started
+    if isinstance(plan, CheckResult):
+        return plan
+
+    cassette = replaying_cassette()
+    script = None
+    if shell_pool is not None and cassette is None:
+        script = shell_pool.resolve_script(plan.raw_command[0])
+
+    spawn_seconds = 0.0
+    timeouts = 0
+    attempt = 0
+    with phase("subprocess"):
+        while True:
+            with _trace_check(plan, attempt) as span:
+                if cassette:
+                    outcome = _replay_check(plan, cassette)
+                elif script:
+                    outcome = _check_in_shell_host(plan, shell_pool, script,
+                                                   timeout)
+                else:
+                    outcome = _run_check_process(plan, timeout)
+                result, spawned, output_bytes = outcome
+                span["status"] = result.status if result else "timeout"
+            spawn_seconds += spawned
+            if result is not None:
+                break
+            timeouts += 1
+            if attempt >= retries:
+                result = timeout_result(plan, timeout)
+                break
+            attempt += 1
+
+    return replace(result,
+                   timings=CheckTimings(
+                       resolve_seconds=resolve_seconds,
+                       spawn_seconds=spawn_seconds,
+                       total_seconds=time.perf_counter() - started,
+                       output_bytes=output_bytes,
+                       timeouts=timeouts,
+                       retries=attempt,
+                   ))
+
+
+def _decode_stream(data: Optional[bytes]) -> str:
+    if not data:
+        return ""
+    # Match the newline handling subprocess.run(text=True) applies.
+    text = data.decode("utf-8", errors="replace")
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+async def _kill_process(process: asyncio.subprocess.Process) -> None:
+    if process.returncode is None:
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+    await process.wait()
+
+
+async def _run_check_process_async(
+        plan: CheckPlan,
+        timeout: int) -> Tuple[Optional[CheckResult], float, int]:
+    spawn_started = time.perf_counter()
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *plan.command,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+    except FileNotFoundError:
+        spawn_seconds = time.perf_counter() - spawn_started
+        return start_failure_result(plan), spawn_seconds, 0
+    spawn_seconds = time.perf_counter() - spawn_started
+    cassette = recording_cassette()
+
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        await _kill_process(process)
+        if cassette:
+            cassette.record(plan.raw_command, "", "", None,
+                            time.perf_counter() - spawn_started, timed_out=True)
+        return None, spawn_seconds, 0
+    except asyncio.CancelledError:
+        # Do not leave orphaned manager processes behind when the caller
+        # abandons the check.
+        await asyncio.shield(_kill_process(process))
+        raise
+
+    decoded_stdout = _decode_stream(stdout)
+    decoded_stderr = _decode_stream(stderr)
+    combined_output = decoded_stdout + decoded_stderr
+    return_code = process.returncode if process.returncode is not None else -1
+    if cassette:
+        cassette.record(plan.raw_command, decoded_stdout, decoded_stderr,
+                        return_code, time.perf_counter() - spawn_started)
+    output_bytes = len(stdout or b"") + len(stderr or b"")
+    result = complete_check(plan, return_code, combined_output)
+    return result, spawn_seconds, output_bytes
+
+
+async def _replay_check_async(
+        plan: CheckPlan,
+        cassette: Cassette) -> Tuple[Optional[CheckResult], float, int]:
+    try:
+        interaction = cassette.replay(plan.raw_command)
+    except CassetteMiss as exc:
+        return _cassette_miss_result(plan, exc), 0.0, 0
+    delay = cassette.delay(interaction)
+    if delay:
+        await asyncio.sleep(delay)
+    return _replayed_check(plan, interaction)
+
+
+async def check_package_async(entry: PackageEntry,
+                              timeout: int,
+                              retries: int = 0) -> CheckResult:
+    started = time.perf_counter()
+    with phase("extraction"):
+        plan = plan_check(entry)
+    resolve_seconds = time.perf_counter() - started
+    if isinstance(plan, CheckResult):
+        return plan
+
+    cassette = replaying_cassette()
+    spawn_seconds = 0.0
+    timeouts = 0
+    attempt = 0
+    with phase("subprocess"):
+        while True:
+            with _trace_check(plan, attempt) as span:
+                if cassette:
+                    outcome = await _replay_check_async(plan, cassette)
+                else:
+                    outcome = await _run_check_process_async(plan, timeout)
+                result, spawned, output_bytes = outcome
+                span["status"] = result.status if result else "timeout"
+            spawn_seconds += spawned
+            if result is not None:
+                break
+            timeouts += 1
+            if attempt >= retries:
+                result = timeout_result(plan, timeout)
+                break
+            attempt += 1
+
+    return replace(result,
+                   timings=CheckTimings(
+                       resolve_seconds=resolve_seconds,
+                       spawn_seconds=spawn_seconds,
+                       total_seconds=time.perf_counter() - started,
+                       output_bytes=output_bytes,
+                       timeouts=timeouts,
+                       retries=attempt,
+                   ))
+
+
+async def check_packages_async(
+    entries: Sequence[PackageEntry],
+    timeout: int,
+    concurrency: int = 8,
+    retries: int = 0,
+    on_result: Optional[Callable[[int, CheckResult], None]] = None,
+    gate: Optional[CheckGate] = None,
+    observe: Optional[CheckObserver] = None,
+) -> List[CheckResult]:
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_one(position: int, entry: PackageEntry) -> CheckResult:
+        async with semaphore:
+            short_circuit = gate(entry) if gate else None
+            if short_circuit:
+                result = short_circuit
+            else:
+                started = time.monotonic()
+                result = await check_package_async(entry, timeout, retries)
+                if observe:
+                    observe(entry, result, time.monotonic() - started)
+        if on_result:
+            on_result(position, result)
+        return result
+
+    return list(await asyncio.gather(
+        *(run_one(position, entry) for position, entry in enumerate(entries))))
+
+
+def _xml_local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _odata_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def build_choco_feed_query(feed: str, identifiers: Sequence[str]) -> str:
+    clauses = " or ".join(f"tolower(Id) eq {_odata_literal(identifier.lower())}"
+                          for identifier in identifiers)
+    query = urllib.parse.urlencode(
+        {
+            "$filter": f"({clauses}) and IsLatestVersion",
+            "$select": "Id,Version",
+        },
+        quote_via=urllib.parse.quote,
+    )
+    return f"{feed.rstrip('/')}/Packages()?{query}"
+
+
+def parse_choco_feed(document: str) -> Tuple[Set[str], Optional[str]]:
+    root = ElementTree.fromstring(document)
+    identifiers: Set[str] = set()
+    for element in root.iter(f"{ATOM_NAMESPACE}entry"):
+        identifier = element.findtext(f".//{ODATA_NAMESPACE}Id")
+        if not identifier:
+            identifier = element.findtext(f"{ATOM_NAMESPACE}title")
+        if identifier:
+            identifiers.add(identifier.strip().lower())
+    next_link = None
+    for link in root.findall(f"{ATOM_NAMESPACE}link"):
+        if link.get("rel") == "next" and link.get("href"):
+            next_link = link.get("href")
+    return identifiers, next_link
+
+
+def query_choco_feed(feed: str, identifiers: Sequence[str],
+                     timeout: int) -> Set[str]:
+    found: Set[str] = set()
+    url: Optional[str] = build_choco_feed_query(feed, identifiers)
+    while url:
+        request = urllib.request.Request(
+            url, headers={"Accept": "application/atom+xml"})
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            document = response.read().decode("utf-8", errors="replace")
+        batch, url = parse_choco_feed(document)
+        found.update(batch)
+    return found
+
+
+def _read_nuspec_id(document: bytes) -> Optional[str]:
+    root = ElementTree.fromstring(document)
+    for element in root.iter():
+        if _xml_local_name(element.tag) == "metadata":
+            for child in element:
+                if _xml_local_name(child.tag) == "id" and child.text:
+                    return child.text.strip()
+    return None
+
+
+def read_choco_folder_ids(directory: Path) -> Set[str]:
+    # Mirrors a Chocolatey folder source: *.nupkg archives, plus loose
+    # *.nuspec files so offline fixtures stay easy to author.
+    identifiers: Set[str] = set()
+    for path in sorted(directory.rglob("*")):
+        suffix = path.suffix.lower()
+        identifier: Optional[str] = None
+        if suffix == ".nuspec":
+            identifier = _read_nuspec_id(path.read_bytes())
+        elif suffix == ".nupkg":
+            with zipfile.ZipFile(path) as archive:
+                for name in archive.namelist():
+                    if name.lower().endswith(".nuspec") and "/" not in name:
+                        identifier = _read_nuspec_id(archive.read(name))
+                        break
+        if identifier:
+            identifiers.add(identifier.lower())
+    return identifiers
+
+
+def resolve_choco_batch(entries: Sequence[PackageEntry],
+                        source: str,
+                        batch_size: int = 25,
+                        timeout: int = 25) -> Dict[int, CheckResult]:
+    identifiers_by_position: Dict[int, str] = {}
+    for position, entry in enumerate(entries):
+        if manager_key(entry) != "choco":
+            continue
+        identifier = extract_choco_identifier(entry.command)
+        if identifier:
+            identifiers_by_position[position] = identifier
+    if not identifiers_by_position:
+        return {}
+
+    source_path = Path(source)
+    found: Set[str] = set()
+    resolved_positions: Set[int] = set()
+    if source_path.is_dir():
+        found = read_choco_folder_ids(source_path)
+        resolved_positions = set(identifiers_by_position)
+        origin = f"folder source {source_path}"
+    else:
+        origin = f"feed {source}"
+        unique = sorted({value.lower() for value in identifiers_by_position.values()})
+        resolved_ids: Set[str] = set()
+        for offset in range(0, len(unique), max(1, batch_size)):
+            batch = unique[offset:offset + max(1, batch_size)]
+            try:
+                found.update(query_choco_feed(source, batch, timeout))
+            except (urllib.error.URLError, OSError,
+                    ElementTree.ParseError) as exc:
+                # Leave this batch for the per-package CLI check.
+                print(f"Chocolatey feed query failed: {exc}", file=sys.stderr)
+                continue
+            resolved_ids.update(batch)
+        resolved_positions = {
+            position
+            for position, identifier in identifiers_by_position.items()
+            if identifier.lower() in resolved_ids
+        }
+
+    results: Dict[int, CheckResult] = {}
+    for position in sorted(resolved_positions):
+        entry = entries[position]
+        identifier = identifiers_by_position[position]
+        if identifier.lower() in found:
+            results[position] = CheckResult(
+                entry, identifier, "ok",
+                f"Chocolatey {origin} lists the package.", None)
+        else:
+            results[position] = CheckResult(
+                entry, identifier, "not-found",
+                f"Chocolatey {origin} has no package with this id.", None)
+    return results
+
+
+def _read_winget_index(database: Path) -> Set[str]:
+    connection = sqlite3.connect(f"{database.resolve().as_uri()}?mode=ro",
+                                 uri=True)
+    try:
+        tables = {
+            row[0].lower()
+            for row in connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+        # Schema v1 keeps identifiers in 'ids'; the v2 source uses 'packages'.
+        if "ids" in tables:
+            rows = connection.execute("SELECT id FROM ids")
+        elif "packages" in tables:
+            rows = connection.execute("SELECT id FROM packages")
+        else:
+            raise ValueError(
+                f"Unrecognised winget index schema in {database}.")
+        return {str(row[0]).casefold() for row in rows if row[0]}
+    finally:
+        connection.close()
+
+
+def load_winget_index(path: Path) -> Set[str]:
+    if path.suffix.lower() != ".msix":
+        return _read_winget_index(path)
+    # source.msix is a zip archive that carries the database as Public/index.db.
+    with zipfile.ZipFile(path) as archive:
+        member = next((name for name in archive.namelist()
+                       if name.replace("\\", "/").lower() == "public/index.db"),
+                      None)
+        if member is None:
+            raise ValueError(f"No Public/index.db found inside {path}.")
+        with tempfile.TemporaryDirectory() as scratch:
+            extracted = Path(archive.extract(member, scratch))
+            return _read_winget_index(extracted)
+
+
+def resolve_winget_index(entries: Sequence[PackageEntry],
+                         index_ids: Set[str]) -> Dict[int, CheckResult]:
+    results: Dict[int, CheckResult] = {}
+    for position, entry in enumerate(entries):
+        if manager_key(entry) != "winget":
+            continue
+        identifier = extract_winget_identifier(entry.command)
+        # Misses fall through to 'winget show', which stays authoritative.
+        if identifier and identifier.casefold() in index_ids:
+            results[position] = CheckResult(
+                entry, identifier, "ok",
+                "winget source index lists the package.", None)
+    return results
+
+
+def _git_head_commit(repository: Path) -> Optional[str]:
+    git_dir = repository / ".git"
+    head_file = git_dir / "HEAD"
+    if not head_file.is_file():
+        return None
+    head = head_file.read_text(encoding="utf-8").strip()
+    if not head.startswith("ref:"):
+        return head or None
+    ref = head.split(":", 1)[1].strip()
+    ref_file = git_dir / ref
+    if ref_file.is_file():
+        return ref_file.read_text(encoding="utf-8").strip() or None
+    packed = git_dir / "packed-refs"
+    if packed.is_file():
+        for line in packed.read_text(encoding="utf-8").splitlines():
+            parts = line.split()
+            if len(parts) == 2 and parts[1] == ref:
+                return parts[0]
+    return None
+
+
+def _scoop_manifest_dir(bucket: Path) -> Path:
+    # Modern buckets keep manifests under bucket/; older ones use the root.
+    nested = bucket / "bucket"
+    return nested if nested.is_dir() else bucket
+
+
+def _scoop_bucket_signature(bucket: Path) -> str:
+    commit = _git_head_commit(bucket)
+    if commit:
+        return f"git:{commit}"
+    # Only manifest names are indexed, so the directory mtime (which moves
+    # when files are added or removed) is enough to detect changes.
+    return f"mtime:{_scoop_manifest_dir(bucket).stat().st_mtime_ns}"
+
+
+def load_scoop_bucket_index(buckets_dir: Path,
+                            cache_file: Optional[Path] = None
+                            ) -> Dict[str, Set[str]]:
+    cached: Dict[str, Dict[str, object]] = {}
+    if cache_file and cache_file.is_file():
+        try:
+            payload = json.loads(cache_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            payload = {}
+        if payload.get("version") == SCOOP_INDEX_CACHE_VERSION:
+            cached = payload.get("buckets", {})
+
+    index: Dict[str, Set[str]] = {}
+    cache_payload: Dict[str, Dict[str, object]] = {}
+    changed = False
+    for bucket in sorted(path for path in buckets_dir.iterdir()
+                         if path.is_dir()):
+        name = bucket.name.lower()
+        signature = _scoop_bucket_signature(bucket)
+        previous = cached.get(name)
+        if (previous and previous.get("signature") == signature
+                and previous.get("path") == str(bucket)):
+            manifests = [str(item) for item in previous.get("manifests", [])]
+        else:
+            manifests = sorted(
+                path.stem.lower()
+                for path in _scoop_manifest_dir(bucket).glob("*.json"))
+            changed = True
+        index[name] = set(manifests)
+        cache_payload[name] = {
+            "path": str(bucket),
+            "signature": signature,
+            "manifests": manifests,
+        }
+
+    if cache_file and (changed or set(cached) != set(cache_payload)):
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            payload = {
+                "version": SCOOP_INDEX_CACHE_VERSION,
+                "buckets": cache_payload,
+            }
+            cache_file.write_text(json.dumps(payload) + "\n",
+                                  encoding="utf-8")
+        except OSError as exc:
+            print(f"Failed to write scoop index cache: {exc}", file=sys.stderr)
+    return index
+
+
+def resolve_scoop_index(
+        entries: Sequence[PackageEntry],
+        bucket_index: Dict[str, Set[str]]) -> Dict[int, CheckResult]:
+    results: Dict[int, CheckResult] = {}
+    for position, entry in enumerate(entries):
+        if manager_key(entry) != "scoop":
+            continue
+        identifier = extract_scoop_identifier(entry.command)
+        if not identifier:
+            continue
+        bucket_prefix, _, app = identifier.rpartition("/")
+        app = app.lower()
+        declared = [bucket.lower() for bucket in entry.buckets]
+        if bucket_prefix:
+            declared = [bucket_prefix.lower()]
+        searched = [bucket for bucket in declared if bucket in bucket_index]
+        if declared and not searched:
+            # None of the declared buckets are added locally; let the CLI
+            # report on it instead of guessing.
+            continue
+        if not declared:
+            searched = sorted(bucket_index)
+        providers = [bucket for bucket in searched if app in bucket_index[bucket]]
+        if providers:
+            results[position] = CheckResult(
+                entry, identifier, "ok",
+                f"Scoop bucket '{providers[0]}' provides the manifest.", None)
+            continue
+        message = f"No manifest named '{app}' in buckets: {', '.join(searched) or '-'}."
+        elsewhere = sorted(bucket for bucket in bucket_index
+                           if bucket not in searched
+                           and app in bucket_index[bucket])
+        if elsewhere:
+            message += f" Available in undeclared buckets: {', '.join(elsewhere)}."
+        results[position] = CheckResult(entry, identifier, "not-found",
+                                        message, None)
+    return results
+
+
+class ResultCache:
+
+    def __init__(self, path: Path, ttl_ok: float,
+                 ttl_not_found: float) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.ttls = {"ok": ttl_ok, "not-found": ttl_not_found}
+        self.hits = 0
+        self.connection = sqlite3.connect(str(path))
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                manager TEXT NOT NULL,
+                identifier TEXT NOT NULL,
+                status TEXT NOT NULL,
+                message TEXT NOT NULL,
+                return_code INTEGER,
+                checked_at REAL NOT NULL,
+                PRIMARY KEY (manager, identifier)
+            )""")
+        self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    @staticmethod
+    def key(entry: PackageEntry,
+            manager_identifier: str) -> Tuple[str, str]:
+        return manager_key(entry), manager_identifier.lower()
+
+    def lookup(self, entry: PackageEntry,
+               now: Optional[float] = None) -> Optional[CheckResult]:
+        manager_identifier = extract_manager_identifier(entry)
+        if not manager_identifier:
+            return None
+        row = self.connection.execute(
+            "SELECT status, message, return_code, checked_at FROM results "
+            "WHERE manager = ? AND identifier = ?",
+            self.key(entry, manager_identifier)).fetchone()
+        if row is None:
+            return None
+        status, message, return_code, checked_at = row
+        ttl = self.ttls.get(status)
+        current = time.time() if now is None else now
+        if ttl is None or current - checked_at > ttl:
+            return None
+        self.hits += 1
+        return CheckResult(entry,
+                           manager_identifier,
+                           status,
+                           message,
+                           return_code,
+                           cached=True)
+
+    def store(self,
+              results: Iterable[CheckResult],
+              now: Optional[float] = None) -> None:
+        checked_at = time.time() if now is None else now
+        rows = [(*self.key(result.entry, result.manager_identifier),
+                 result.status, result.message, result.return_code,
+                 checked_at) for result in results
+                if result.manager_identifier and not result.cached
+                and result.status in CACHEABLE_STATUSES]
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO results "
+            "(manager, identifier, status, message, return_code, checked_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)", rows)
+        self.connection.commit()
+
+
+def probe_manager(cli_name: str, timeout: int) -> Optional[str]:
+    command = PREFLIGHT_COMMANDS.get(cli_name)
+    if not command:
+        return None
+    replay = replaying_cassette()
+    if replay:
+        # Replays never touch the real manager; only a recorded failure
+        # should keep it out of the run.
+        try:
+            interaction = replay.replay(command)
+        except CassetteMiss:
+            return None
+        if interaction.timed_out:
+            return f"'{' '.join(command)}' exceeded the {timeout}s timeout."
+        return_code = interaction.return_code
+        output = interaction.stdout + interaction.stderr
+    else:
+        record = recording_cassette()
+        started = time.perf_counter()
+        try:
+            completed = subprocess.run(
+                _prepare_command(command),
+                capture_output=True,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                timeout=timeout,
+                check=False,
+            )
+        except FileNotFoundError:
+            return f"'{cli_name}' is not installed or not on PATH."
+        except subprocess.TimeoutExpired:
+            if record:
+                record.record(command, "", "", None,
+                              time.perf_counter() - started, timed_out=True)
+            return f"'{' '.join(command)}' exceeded the {timeout}s timeout."
+        if record:
+            record.record(command, completed.stdout or "", completed.stderr
+                          or "", completed.returncode,
+                          time.perf_counter() - started)
+        return_code = completed.returncode
+        output = (completed.stdout or "") + (completed.stderr or "")
+    if return_code != 0:
+        return (f"'{' '.join(command)}' exited with {return_code}: "
+                f"{summarize_output(output)}")
+    return None
+
+
+class CircuitBreaker:
+
+    def __init__(self, threshold: int) -> None:
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._consecutive_errors: Dict[str, int] = {}
+        self._open: Dict[str, str] = {}
+
+    def trip(self, key: str, reason: str) -> None:
+        with self._lock:
+            self._open.setdefault(key, reason)
+
+    def open_reason(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._open.get(key)
+
+    def short_circuit(self, entry: PackageEntry) -> Optional[CheckResult]:
+        key = manager_key(entry)
+        reason = self.open_reason(key)
+        if reason is None:
+            return None
+        return CheckResult(entry, extract_manager_identifier(entry),
+                           "unavailable",
+                           f"Not checked; {key} is unavailable: {reason}",
+                           None)
+
+    def record(self, entry: PackageEntry, result: CheckResult) -> None:
+        key = manager_key(entry)
+        with self._lock:
+            if result.status == "error":
+                count = self._consecutive_errors.get(key, 0) + 1
+                self._consecutive_errors[key] = count
+                if self.threshold > 0 and count >= self.threshold:
+                    self._open.setdefault(
+                        key, f"{count} consecutive errors, last: "
+                        f"{result.message}")
+            elif result.status in CACHEABLE_STATUSES:
+                self._consecutive_errors[key] = 0
+
+    def observe(self, entry: PackageEntry, result: CheckResult,
+                elapsed: float) -> None:
+        self.record(entry, result)
+
+
+class TimeBudget:
+
+    def __init__(self, seconds: float,
+                 started: Optional[float] = None) -> None:
+        self.seconds = seconds
+        self.deadline = (time.monotonic()
+                         if started is None else started) + seconds
+
+    def short_circuit(self, entry: PackageEntry) -> Optional[CheckResult]:
+        if time.monotonic() < self.deadline:
+            return None
         return CheckResult(
-            entry, manager_identifier, "error",
-            f"Verification command exceeded the {timeout}s timeout.", None)
+            entry, extract_manager_identifier(entry), "deferred",
+            f"Not checked; the {self.seconds:g}s time budget was spent.",
+            None)
+
+
+class RunHistory:
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.records: Dict[str, Dict[str, object]] = {}
+        if path.is_file():
+            try:
+                payload = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                payload = {}
+            if payload.get("version") == RUN_HISTORY_VERSION:
+                self.records = payload.get("entries", {})
+
+    @staticmethod
+    def key(entry: PackageEntry) -> str:
+        return f"{manager_key(entry)}:{entry.package_id.lower()}"
+
+    def priority(self, entry: PackageEntry) -> Tuple[int, float]:
+        record = self.records.get(self.key(entry))
+        if record is None:
+            return 1, 0.0
+        duration = float(record.get("duration") or 0.0)
+        if record.get("last_status") in FAILURE_STATUSES:
+            tier = 0
+        elif record.get("fingerprint") != entry_fingerprint(entry):
+            tier = 1
+        elif int(record.get("ok_streak") or 0) >= STABLE_OK_STREAK:
+            tier = 3
+        else:
+            tier = 2
+        # Slow entries first within a tier: they are the ones a time budget
+        # would otherwise never reach.
+        return tier, -duration
+
+    def update(self, result: CheckResult,
+               elapsed: Optional[float] = None) -> None:
+        if result.status not in HISTORY_STATUSES:
+            return
+        key = self.key(result.entry)
+        record = dict(self.records.get(key, {}))
+        streak = int(record.get("ok_streak") or 0)
+        record["ok_streak"] = streak + 1 if result.status == "ok" else 0
+        record["last_status"] = result.status
+        record["fingerprint"] = entry_fingerprint(result.entry)
+        record["checked_at"] = time.time()
+        if elapsed is not None:
+            previous = record.get("duration")
+            record["duration"] = elapsed if previous is None else (
+                0.5 * float(previous) + 0.5 * elapsed)
+        self.records[key] = record
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"version": RUN_HISTORY_VERSION, "entries": self.records}
+        self.path.write_text(json.dumps(payload, indent=2, sort_keys=True) +
+                             "\n",
+                             encoding="utf-8")
+
+
+class ProgressReporter:
+
+    def __init__(self, total: int, concurrent: bool,
+                 stream: Optional[TextIO] = None) -> None:
+        self.total = total
+        self.concurrent = concurrent
+        self.stream = stream if stream is not None else sys.stdout
+        self.completed = 0
+        self._pending_line = ""
+
+    def start(self, position: int, entry: PackageEntry) -> None:
+        # Overlapping checks would clobber each other's in-place line, so
+        # concurrent runs only report completions.
+        if self.concurrent:
+            return
+        prefix = f"[{position + 1}/{self.total}]"
+        self._pending_line = f"{prefix} Checking {entry.package_id} ({entry.manager})..."
+        print(self._pending_line, end="", file=self.stream, flush=True)
+
+    def finish(self, position: int, result: CheckResult) -> None:
+        self.completed += 1
+        status_label = result.status.upper()
+        if self.concurrent:
+            prefix = f"[{self.completed}/{self.total}]"
+            print(f"{prefix} {result.entry.package_id} -> {status_label}",
+                  file=self.stream,
+                  flush=True)
+            return
+        prefix = f"[{position + 1}/{self.total}]"
+        final_line = f"{prefix} {result.entry.package_id} -> {status_label}"
+        padding = " " * max(0, len(self._pending_line) - len(final_line))
+        print(f"\r{final_line}{padding}", file=self.stream, flush=True)
+        self._pending_line = ""
+
+
+def run_checks(
+    entries: Sequence[PackageEntry],
+    check: Callable[[PackageEntry], CheckResult],
+    jobs: int = 1,
+    on_start: Optional[Callable[[int, PackageEntry], None]] = None,
+    on_result: Optional[Callable[[int, CheckResult], None]] = None,
+) -> List[CheckResult]:
+    results: List[Optional[CheckResult]] = [None] * len(entries)
+    if jobs <= 1:
+        for position, entry in enumerate(entries):
+            if on_start:
+                on_start(position, entry)
+            result = check(entry)
+            results[position] = result
+            if on_result:
+                on_result(position, result)
+        return [result for result in results if result is not None]
+
+    executor = ThreadPoolExecutor(max_workers=jobs,
+                                  thread_name_prefix="catalog-check")
+    try:
+        futures = {}
+        for position, entry in enumerate(entries):
+            if on_start:
+                on_start(position, entry)
+            futures[executor.submit(check, entry)] = position
+        for future in as_completed(futures):
+            position = futures[future]
+            result = future.result()
+            results[position] = result
+            if on_result:
+                on_result(position, result)
+    except BaseException:
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown(wait=True)
+    return [result for result in results if result is not None]
+
+
+class ManagerBudget:
+
+    def __init__(self,
+                 initial: int,
+                 maximum: int,
+                 minimum: int = 1,
+                 decrease_factor: float = 0.5,
+                 latency_tolerance: float = 1.5,
+                 smoothing: float = 0.3) -> None:
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = min(max(initial, self.minimum), self.maximum)
+        self.peak = self.limit
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+        self.in_flight = 0
+        self.latency: Optional[float] = None
+        self.baseline_latency: Optional[float] = None
+        self._window_successes = 0
+
+    def has_capacity(self) -> bool:
+        return self.in_flight < self.limit
+
+    def acquire(self) -> None:
+        self.in_flight += 1
+
+    def release(self, result: Optional[CheckResult], elapsed: float) -> None:
+        self.in_flight = max(0, self.in_flight - 1)
+        if result is None or result.status in ("error", "unavailable"):
+            # Timeouts, manager failures and tripped gates all back off.
+            self.limit = max(self.minimum,
+                             int(self.limit * self.decrease_factor))
+            self._window_successes = 0
+            return
+        if result.timings is None:
+            # Skipped entries and gate short-circuits never ran a command, so
+            # their near-zero latency says nothing about the manager.
+            return
+
+        if self.latency is None:
+            self.latency = elapsed
+        else:
+            self.latency += self.smoothing * (elapsed - self.latency)
+        if self.baseline_latency is None or self.latency < self.baseline_latency:
+            self.baseline_latency = self.latency
+        if self.latency > self.baseline_latency * self.latency_tolerance:
+            # Latency is climbing; hold the current level rather than growing.
+            self._window_successes = 0
+            return
+
+        self._window_successes += 1
+        if self._window_successes >= self.limit:
+            self._window_successes = 0
+            if self.limit < self.maximum:
+                self.limit += 1
+                self.peak = max(self.peak, self.limit)
+
+
+def create_manager_budgets(
+        entries: Iterable[PackageEntry], jobs: int,
+        initial_limits: Optional[Dict[str, int]] = None
+) -> Dict[str, ManagerBudget]:
+    limits = dict(DEFAULT_MANAGER_CONCURRENCY)
+    limits.update(initial_limits or {})
+    budgets: Dict[str, ManagerBudget] = {}
+    for entry in entries:
+        key = manager_key(entry)
+        if key not in budgets:
+            budgets[key] = ManagerBudget(limits.get(key, 1), maximum=jobs)
+    return budgets
+
+
+def run_checks_adaptive(
+    entries: Sequence[PackageEntry],
+    check: Callable[[PackageEntry], CheckResult],
+    budgets: Dict[str, ManagerBudget],
+    jobs: int,
+    on_start: Optional[Callable[[int, PackageEntry], None]] = None,
+    on_result: Optional[Callable[[int, CheckResult], None]] = None,
+) -> List[CheckResult]:
+    results: List[Optional[CheckResult]] = [None] * len(entries)
+    pending: Dict[str, Deque[int]] = {}
+    for position, entry in enumerate(entries):
+        pending.setdefault(manager_key(entry),
+                           collections.deque()).append(position)
+
+    condition = threading.Condition()
+    finished: Deque[Tuple[int, Optional[CheckResult],
+                          Optional[BaseException]]] = collections.deque()
+    in_flight = 0
+
+    def worker(position: int, budget: ManagerBudget) -> None:
+        started = time.monotonic()
+        result: Optional[CheckResult] = None
+        error: Optional[BaseException] = None
+        try:
+            result = check(entries[position])
+        except BaseException as exc:  # Re-raised on the scheduling thread.
+            error = exc
+        elapsed = time.monotonic() - started
+        with condition:
+            budget.release(result, elapsed)
+            finished.append((position, result, error))
+            condition.notify_all()
+
+    executor = ThreadPoolExecutor(max_workers=jobs,
+                                  thread_name_prefix="catalog-check")
+    remaining = len(entries)
+    try:
+        with condition:
+            while remaining:
+                # Round-robin across managers so one deep queue cannot claim
+                # every global slot.
+                dispatched = True
+                while dispatched and in_flight < jobs:
+                    dispatched = False
+                    for key, positions in pending.items():
+                        budget = budgets[key]
+                        if not positions or not budget.has_capacity():
+                            continue
+                        if in_flight >= jobs:
+                            break
+                        position = positions.popleft()
+                        budget.acquire()
+                        in_flight += 1
+                        dispatched = True
+                        if on_start:
+                            on_start(position, entries[position])
+                        executor.submit(worker, position, budget)
+
+                while not finished:
+                    condition.wait()
+                while finished:
+                    position, result, error = finished.popleft()
+                    in_flight -= 1
+                    remaining -= 1
+                    if error is not None:
+                        raise error
+                    results[position] = result
+                    if on_result and result is not None:
+                        on_result(position, result)
+    except BaseException:
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown(wait=True)
+    return [result for result in results if result is not None]
 
-    combined_output = (completed.stdout or "") + (completed.stderr or "")
-    status, message = interpret_manager_result(entry.manager,
-                                               manager_identifier,
-                                               completed.returncode,
-                                               combined_output)
-    return CheckResult(entry, manager_identifier, status, message,
-                       completed.returncode)
+
+def describe_budgets(budgets: Dict[str, ManagerBudget]) -> str:
+    parts = [
+        f"{key} {budget.limit} (peak {budget.peak})"
+        for key, budget in sorted(budgets.items())
+    ]
+    return "Adaptive concurrency: " + ", ".join(parts)
 
 
 def render_results(results: Sequence[CheckResult], root: Path) -> None:
-    header = f"{'STATUS':<10} {'PACKAGE':<24} {'MANAGER':<10} {'MANAGER-ID':<28} SOURCE"
+    header = f"{'STATUS':<12} {'PACKAGE':<24} {'MANAGER':<10} {'MANAGER-ID':<28} SOURCE"
     print(header)
     print("-" * len(header))
     for result in results:
@@ -391,43 +1793,273 @@ def render_results(results: Sequence[CheckResult], root: Path) -> None:
         source = f"{relative}#{entry.index}"
         manager_identifier = result.manager_identifier or "-"
         print(
-            f"{result.status.upper():<10} {entry.package_id:<24} {entry.manager:<10} {manager_identifier:<28} {source}"
+            f"{result.status.upper():<12} {entry.package_id:<24} {entry.manager:<10} {manager_identifier:<28} {source}"
         )
         if result.status.lower() != "ok":
             print(f"  {result.message}")
 
     counts = collections.Counter(res.status for res in results)
     print("\nSummary:")
-    for key in ("ok", "not-found", "error", "skipped"):
+    for key in SUMMARY_STATUSES:
         if counts.get(key):
             print(f"  {key}: {counts[key]}")
+    cached = sum(1 for res in results if res.cached)
+    if cached:
+        print(f"  served from cache: {cached}")
+    coalesced = sum(1 for res in results if res.coalesced)
+    if coalesced:
+        print(f"  coalesced (spawns saved): {coalesced}")
+
+    render_latency_summary(results)
+
+
+def percentile(sorted_values: Sequence[float], percent: float) -> float:
+    # Nearest-rank percentile; callers pass values in ascending order.
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def render_latency_summary(results: Sequence[CheckResult],
+                           slowest: int = 5) -> None:
+    timed = [
+        res for res in results if res.timings is not None and not res.coalesced
+    ]
+    if not timed:
+        return
+    by_manager: Dict[str, List[float]] = collections.defaultdict(list)
+    for res in timed:
+        by_manager[manager_key(res.entry)].append(res.timings.total_seconds)
+    print("\nLatency (seconds):")
+    print(f"  {'MANAGER':<10} {'CHECKS':>6} {'P50':>8} {'P90':>8} {'P99':>8}")
+    for manager in sorted(by_manager):
+        values = sorted(by_manager[manager])
+        print(f"  {manager:<10} {len(values):>6} "
+              f"{percentile(values, 50):>8.3f} {percentile(values, 90):>8.3f} "
+              f"{percentile(values, 99):>8.3f}")
+    print("Slowest checks:")
+    ordered = sorted(timed,
+                     key=lambda res: res.timings.total_seconds,
+                     reverse=True)
+    for res in ordered[:slowest]:
+        timings = res.timings
+        print(f"  {timings.total_seconds:8.3f}s {res.entry.package_id} "
+              f"({res.entry.manager}: {res.manager_identifier or '-'}, "
+              f"spawn {timings.spawn_seconds:.3f}s, "
+              f"{timings.output_bytes} bytes, {timings.timeouts} timeouts)")
+
+
+def result_to_record(result: CheckResult, root: Path) -> Dict[str, object]:
+    entry = result.entry
+    try:
+        relative_path = entry.file_path.relative_to(root)
+        file_path = str(relative_path)
+    except ValueError:
+        file_path = str(entry.file_path)
+    return {
+        "package_id": entry.package_id,
+        "manager": entry.manager,
+        "command": entry.command,
+        "name": entry.name,
+        "file_path": file_path,
+        "index": entry.index,
+        "status": result.status,
+        "message": result.message,
+        "manager_identifier": result.manager_identifier,
+        "return_code": result.return_code,
+        "cached": result.cached,
+        "coalesced": result.coalesced,
+        "timings": asdict(result.timings) if result.timings else None,
+    }
 
 
 def render_results_json(results: Sequence[CheckResult], root: Path) -> None:
-    data = []
-    for result in results:
-        entry = result.entry
-        try:
-            relative_path = entry.file_path.relative_to(root)
-            file_path = str(relative_path)
-        except ValueError:
-            file_path = str(entry.file_path)
-        data.append({
-            "package_id": entry.package_id,
-            "manager": entry.manager,
-            "command": entry.command,
-            "name": entry.name,
-            "file_path": file_path,
-            "index": entry.index,
-            "status": result.status,
-            "message": result.message,
-            "manager_identifier": result.manager_identifier,
-            "return_code": result.return_code,
-        })
+    data = [result_to_record(result, root) for result in results]
     json.dump(data, sys.stdout, indent=2)
     print()
 
 
+def _metric_label(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace("\n", "\\n")
+    return escaped.replace('"', '\\"')
+
+
+def render_openmetrics(results: Sequence[CheckResult], duration: float,
+                       cache_enabled: bool) -> str:
+    lines: List[str] = []
+
+    def family(name: str, kind: str, description: str) -> str:
+        metric = f"{METRIC_PREFIX}_{name}"
+        lines.append(f"# TYPE {metric} {kind}")
+        lines.append(f"# HELP {metric} {description}")
+        return metric
+
+    counts: Dict[Tuple[str, str], int] = collections.Counter(
+        (manager_key(res.entry), res.status) for res in results)
+    metric = family("results", "gauge",
+                    "Catalog entries by manager and status in the last run.")
+    for (manager, status), count in sorted(counts.items()):
+        lines.append(f'{metric}{{manager="{_metric_label(manager)}",'
+                     f'status="{_metric_label(status)}"}} {count}')
+
+    # Only checks that actually ran a command contribute latency samples;
+    # cached and coalesced results would skew the distribution toward zero.
+    latencies: Dict[str, List[float]] = collections.defaultdict(list)
+    timeouts: Dict[str, int] = collections.Counter()
+    for res in results:
+        if res.timings is None or res.coalesced or res.cached:
+            continue
+        manager = manager_key(res.entry)
+        latencies[manager].append(res.timings.total_seconds)
+        timeouts[manager] += res.timings.timeouts
+
+    metric = family("check_duration_seconds", "histogram",
+                    "Wall-clock duration of manager verification commands.")
+    for manager in sorted(latencies):
+        label = f'manager="{_metric_label(manager)}"'
+        values = latencies[manager]
+        for bound in LATENCY_BUCKETS:
+            count = sum(1 for value in values if value <= bound)
+            lines.append(f'{metric}_bucket{{{label},le="{bound}"}} {count}')
+        lines.append(f'{metric}_bucket{{{label},le="+Inf"}} {len(values)}')
+        lines.append(f"{metric}_count{{{label}}} {len(values)}")
+        lines.append(f"{metric}_sum{{{label}}} {sum(values):.6f}")
+
+    metric = family("check_timeouts", "gauge",
+                    "Verification command timeouts, including retried ones.")
+    for manager in sorted(latencies):
+        lines.append(f'{metric}{{manager="{_metric_label(manager)}"}} '
+                     f"{timeouts[manager]}")
+
+    if cache_enabled:
+        metric = family("cache_hit_ratio", "gauge",
+                        "Share of catalog entries served from the result cache.")
+        cached = sum(1 for res in results if res.cached)
+        ratio = cached / len(results) if results else 0.0
+        lines.append(f"{metric} {ratio:.6f}")
+
+    metric = family("run_duration_seconds", "gauge",
+                    "Total wall-clock duration of the last run.")
+    lines.append(f"{metric} {duration:.6f}")
+    metric = family("run_timestamp_seconds", "gauge",
+                    "Unix time at which the last run finished.")
+    lines.append(f"{metric} {time.time():.3f}")
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+class JsonLinesWriter:
+
+    def __init__(self, root: Path, stream: Optional[TextIO] = None) -> None:
+        self.root = root
+        self.stream = stream if stream is not None else sys.stdout
+        self._written: Set[int] = set()
+
+    def write(self, result: CheckResult) -> None:
+        self.stream.write(json.dumps(result_to_record(result, self.root)) +
+                          "\n")
+        self.stream.flush()
+
+    def mark_written(self, positions: Iterable[int]) -> None:
+        self._written.update(positions)
+
+    def write_positions(self, resolved: Dict[int, CheckResult],
+                        positions: Iterable[int]) -> None:
+        for position in positions:
+            if position in self._written:
+                continue
+            self._written.add(position)
+            self.write(resolved[position])
+
+    def sync(self, resolved: Dict[int, CheckResult]) -> None:
+        # Scans everything resolved so far; meant for the bulk phases, not
+        # for every single completed check.
+        self.write_positions(resolved, sorted(set(resolved) - self._written))
+
+
+class CheckpointJournal(JsonLinesWriter):
+
+    def __init__(self, path: Path, root: Path, append: bool) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        needs_newline = False
+        if append and path.is_file() and path.stat().st_size:
+            with path.open("rb") as existing:
+                existing.seek(-1, os.SEEK_END)
+                needs_newline = existing.read(1) != b"\n"
+        self.handle = path.open("a" if append else "w", encoding="utf-8")
+        if needs_newline:
+            # Terminate a line left truncated by an interrupted run.
+            self.handle.write("\n")
+        super().__init__(root, self.handle)
+
+    def write(self, result: CheckResult) -> None:
+        if result.status in ("deferred", "unavailable"):
+            # Deferred and short-circuited entries were never checked;
+            # --resume must pick them up.
+            return
+        super().write(result)
+        # Flushing alone survives a killed process; fsync also survives the
+        # build agent itself going away.
+        os.fsync(self.handle.fileno())
+
+    def close(self) -> None:
+        self.handle.close()
+
+
+def entry_key(entry: PackageEntry, root: Path) -> Tuple[str, int, str]:
+    try:
+        file_path = entry.file_path.relative_to(root)
+    except ValueError:
+        file_path = entry.file_path
+    return file_path.as_posix(), entry.index, entry.package_id
+
+
+def load_journal(path: Path) -> Dict[Tuple[str, int, str], Dict[str, object]]:
+    records: Dict[Tuple[str, int, str], Dict[str, object]] = {}
+    if not path.is_file():
+        return records
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                raw = json.loads(line)
+                key = (Path(str(raw["file_path"])).as_posix(),
+                       int(raw["index"]), str(raw["package_id"]))
+            except (ValueError, KeyError, TypeError):
+                # A run killed mid-write can leave a truncated final line.
+                continue
+            records[key] = raw
+    return records
+
+
+def entry_from_record(raw: Dict[str, object], root: Path) -> PackageEntry:
+    file_path = Path(str(raw.get("file_path", "") or ""))
+    if not file_path.is_absolute():
+        file_path = root / file_path
+    return PackageEntry(
+        package_id=str(raw.get("package_id", "")),
+        manager=str(raw.get("manager", "")),
+        command=str(raw.get("command", "")),
+        name=str(raw.get("name", "")),
+        file_path=file_path,
+        index=int(raw.get("index", 0) or 0),
+    )
+
+
+def result_from_record(entry: PackageEntry,
+                       raw: Dict[str, object]) -> CheckResult:
+    return_code = raw.get("return_code")
+    timings = raw.get("timings")
+    return CheckResult(
+        entry,
+        str(raw.get("manager_identifier") or "") or None,
+        str(raw.get("status", "")),
+        str(raw.get("message", "")),
+        int(return_code) if return_code is not None else None,
+        cached=bool(raw.get("cached", False)),
+        coalesced=bool(raw.get("coalesced", False)),
+        timings=CheckTimings(**timings) if isinstance(timings, dict) else None,
+    )
+
+
 def parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description=
@@ -446,9 +2078,10 @@ def parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
     )
     parser.add_argument(
         "--format",
-        choices=("table", "json"),
+        choices=("table", "json", "jsonl"),
         default="table",
-        help="Output format (defaults to 'table').",
+        help=
+        "Output format (defaults to 'table'). 'jsonl' streams one record per line as checks complete.",
     )
     parser.add_argument(
         "--manager",
@@ -470,11 +2103,249 @@ def parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
         default=25,
         help="Per-package timeout in seconds (defaults to 25).",
     )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=0,
+        help=
+        "Re-run a verification command this many times after a timeout (defaults to 0).",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help=
+        "Number of verification commands to run concurrently (defaults to 1).",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=("thread", "asyncio"),
+        default="thread",
+        help=
+        "Concurrency backend used for verification commands (defaults to 'thread').",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help=
+        "Schedule checks with a self-adjusting concurrency budget per manager, capped by --jobs.",
+    )
+    parser.add_argument(
+        "--manager-concurrency",
+        dest="manager_concurrency",
+        action="append",
+        default=[],
+        metavar="MANAGER=N",
+        help=
+        "Initial concurrency for a manager when --adaptive is set (repeatable).",
+    )
+    parser.add_argument(
+        "--choco-source",
+        nargs="?",
+        const=DEFAULT_CHOCO_FEED,
+        default=None,
+        help=
+        "Resolve choco entries in bulk against a NuGet v2 feed URL or a local folder source "
+        f"instead of one 'choco search' per package (defaults to {DEFAULT_CHOCO_FEED}).",
+    )
+    parser.add_argument(
+        "--choco-batch-size",
+        type=int,
+        default=25,
+        help="Identifiers per Chocolatey feed query (defaults to 25).",
+    )
+    parser.add_argument(
+        "--winget-index",
+        type=Path,
+        default=None,
+        help=
+        "Resolve winget entries against a source index (index.db or source.msix) before spawning winget.",
+    )
+    parser.add_argument(
+        "--scoop-buckets",
+        nargs="?",
+        type=Path,
+        const=_default_scoop_buckets_dir(),
+        default=None,
+        help=
+        "Resolve scoop entries from local bucket manifests instead of 'scoop search' "
+        "(defaults to $SCOOP/buckets).",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help=f"Directory for on-disk caches (defaults to {DEFAULT_CACHE_DIR}).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Neither read nor write the persistent result cache.",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached results but store fresh ones.",
+    )
+    parser.add_argument(
+        "--cache-ttl-ok",
+        type=float,
+        default=24.0,
+        help="Hours an 'ok' result stays valid in the cache (defaults to 24).",
+    )
+    parser.add_argument(
+        "--cache-ttl-not-found",
+        type=float,
+        default=6.0,
+        help=
+        "Hours a 'not-found' result stays valid in the cache (defaults to 6).",
+    )
+    parser.add_argument(
+        "--changed-since-manifest",
+        type=Path,
+        default=None,
+        help=
+        "Only verify entries whose fingerprint is missing from this manifest (see --write-manifest).",
+    )
+    parser.add_argument(
+        "--changed-since",
+        metavar="GIT_REF",
+        default=None,
+        help=
+        "Only verify entries added or changed relative to the catalog at this git ref.",
+    )
+    parser.add_argument(
+        "--write-manifest",
+        type=Path,
+        default=None,
+        help=
+        "Write the fingerprints of all matched entries to this manifest after the run.",
+    )
+    parser.add_argument(
+        "--warm-shell",
+        type=int,
+        nargs="?",
+        const=2,
+        default=0,
+        metavar="HOSTS",
+        help=
+        "Run .ps1 shim managers (such as scoop) inside long-lived PowerShell hosts "
+        "instead of one pwsh process per check (defaults to 2 hosts).",
+    )
+    parser.add_argument(
+        "--shell-host-command",
+        default=None,
+        metavar="COMMAND",
+        help=
+        "Start --warm-shell hosts with this command instead of pwsh and route every manager "
+        "on PATH through them (e.g. 'python3 tools/fake_powershell_host.py').",
+    )
+    parser.add_argument(
+        "--shard",
+        metavar="K/N",
+        default=None,
+        help=
+        "Only verify shard K of N, partitioned by a stable hash of the manager identifier.",
+    )
+    parser.add_argument(
+        "--history",
+        type=Path,
+        default=None,
+        help=
+        "Run history file used to check previously failing, changed and slow entries first; "
+        "updated after each run.",
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help=
+        "Stop launching new checks once this many seconds have passed; remaining entries are reported as deferred.",
+    )
+    parser.add_argument(
+        "--journal",
+        type=Path,
+        default=None,
+        help=
+        "Append each result to this checkpoint journal as soon as it is known.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=
+        "Reuse results already recorded in --journal and only check the remaining entries.",
+    )
+    parser.add_argument(
+        "--no-coalesce",
+        action="store_true",
+        help=
+        "Verify every entry separately even when several share a manager identifier.",
+    )
+    parser.add_argument(
+        "--no-preflight",
+        action="store_true",
+        help="Skip probing each manager CLI once before checking its entries.",
+    )
+    parser.add_argument(
+        "--breaker-threshold",
+        type=int,
+        default=5,
+        help=
+        "Stop checking a manager after this many consecutive errors; 0 disables (defaults to 5).",
+    )
     parser.add_argument(
         "--strict",
         action="store_true",
         help="Treat skipped packages as failures in the exit code.",
     )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="PATH",
+        help=
+        "Write a cProfile dump to PATH and print a per-phase timing breakdown to stderr.",
+    )
+    parser.add_argument(
+        "--trace-out",
+        type=Path,
+        metavar="PATH",
+        help=
+        "Write a Chrome Trace Event JSON file (viewable in Perfetto) with a span per manager command.",
+    )
+    parser.add_argument(
+        "--metrics-out",
+        type=Path,
+        metavar="PATH",
+        help=
+        "Atomically write OpenMetrics text (for a node-exporter textfile collector) to PATH on completion.",
+    )
+    parser.add_argument(
+        "--memory-report",
+        action="store_true",
+        help=
+        "Trace allocations and print the top allocation sites and peak RSS to stderr.",
+    )
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument(
+        "--record-cassette",
+        type=Path,
+        metavar="PATH",
+        help=
+        "Record every manager command with its output, exit code and latency to PATH.",
+    )
+    cassette_group.add_argument(
+        "--replay-cassette",
+        type=Path,
+        metavar="PATH",
+        help=
+        "Serve manager commands from a recorded cassette instead of running them.",
+    )
+    parser.add_argument(
+        "--replay-latency",
+        action="store_true",
+        help="When replaying, sleep for each command's recorded latency.",
+    )
     return parser.parse_args(argv)
 
 
@@ -492,51 +2363,549 @@ def filter_entries(entries: Iterable[PackageEntry], managers: Sequence[str],
     return filtered
 
 
+def parse_manager_limits(values: Sequence[str]) -> Dict[str, int]:
+    limits: Dict[str, int] = {}
+    for value in values:
+        manager, sep, count = value.partition("=")
+        manager_key = manager.strip().lower()
+        if not sep or not manager_key or not count.strip().isdigit():
+            raise ValueError(
+                f"Invalid manager concurrency '{value}'. Expected MANAGER=N.")
+        limits[CLI_NAME_BY_MANAGER.get(manager_key,
+                                       manager_key)] = int(count)
+    return limits
+
+
+def apply_resolver(
+    entries: Sequence[PackageEntry], resolved: Dict[int, CheckResult],
+    resolver: Callable[[Sequence[PackageEntry]], Dict[int, CheckResult]]
+) -> int:
+    pending = [
+        position for position in range(len(entries))
+        if position not in resolved
+    ]
+    found = resolver([entries[position] for position in pending])
+    for local_position, result in found.items():
+        resolved[pending[local_position]] = result
+    return len(found)
+
+
+def group_duplicate_checks(
+        entries: Sequence[PackageEntry]) -> List[List[int]]:
+    groups: List[List[int]] = []
+    group_by_key: Dict[Tuple[str, str], List[int]] = {}
+    for position, entry in enumerate(entries):
+        identifier = extract_manager_identifier(entry)
+        if not identifier:
+            groups.append([position])
+            continue
+        key = (manager_key(entry), identifier.lower())
+        group = group_by_key.get(key)
+        if group is None:
+            group = group_by_key[key] = []
+            groups.append(group)
+        group.append(position)
+    return groups
+
+
+def fan_out_result(result: CheckResult, entry: PackageEntry) -> CheckResult:
+    # A spawn is only saved when the leader actually ran; gate short-circuits
+    # and skipped leaders never had one to share.
+    return replace(result,
+                   entry=entry,
+                   manager_identifier=extract_manager_identifier(entry),
+                   coalesced=result.timings is not None)
+
+
+def execute_checks(
+        entries: Sequence[PackageEntry],
+        args: argparse.Namespace,
+        manager_limits: Dict[str, int],
+        show_progress: bool,
+        shell_pool: Optional[PowerShellHostPool] = None,
+        gates: Sequence[CheckGate] = (),
+        observers: Sequence[CheckObserver] = (),
+        on_result: Optional[Callable[[int, CheckResult], None]] = None
+) -> List[CheckResult]:
+    if not entries:
+        return []
+
+    def gate(entry: PackageEntry) -> Optional[CheckResult]:
+        for candidate in gates:
+            short_circuit = candidate(entry)
+            if short_circuit:
+                return short_circuit
+        return None
+
+    def observe(entry: PackageEntry, result: CheckResult,
+                elapsed: float) -> None:
+        for observer in observers:
+            observer(entry, result, elapsed)
+
+    def check(entry: PackageEntry) -> CheckResult:
+        short_circuit = gate(entry)
+        if short_circuit:
+            return short_circuit
+        started = time.monotonic()
+        result = check_package(entry, args.timeout, shell_pool, args.retries)
+        observe(entry, result, time.monotonic() - started)
+        return result
+
+    concurrent = args.backend == "asyncio" or args.adaptive or args.jobs > 1
+    progress = ProgressReporter(len(entries), concurrent=concurrent)
+
+    def finished(position: int, result: CheckResult) -> None:
+        if show_progress:
+            progress.finish(position, result)
+        if on_result:
+            on_result(position, result)
+
+    if args.backend == "asyncio":
+        return asyncio.run(
+            check_packages_async(
+                entries,
+                args.timeout,
+                concurrency=args.jobs,
+                retries=args.retries,
+                on_result=finished,
+                gate=gate,
+                observe=observe,
+            ))
+    if args.adaptive:
+        budgets = create_manager_budgets(entries, args.jobs, manager_limits)
+        results = run_checks_adaptive(
+            entries,
+            check,
+            budgets,
+            args.jobs,
+            on_result=finished,
+        )
+        if show_progress:
+            print(describe_budgets(budgets))
+        return results
+    return run_checks(
+        entries,
+        check,
+        jobs=args.jobs,
+        on_start=progress.start if show_progress else None,
+        on_result=finished,
+    )
+
+
+def entry_fingerprint(entry: PackageEntry) -> str:
+    normalized = [
+        entry.package_id.lower(),
+        entry.manager.lower(),
+        " ".join(split_command(entry.command)),
+    ]
+    return hashlib.sha256(
+        json.dumps(normalized).encode("utf-8")).hexdigest()
+
+
+def load_fingerprint_manifest(path: Path) -> Set[str]:
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if payload.get("version") != FINGERPRINT_MANIFEST_VERSION:
+        raise ValueError(
+            f"Unsupported fingerprint manifest version in {path}.")
+    return set(payload.get("fingerprints", []))
+
+
+def write_fingerprint_manifest(path: Path,
+                               entries: Iterable[PackageEntry]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "version": FINGERPRINT_MANIFEST_VERSION,
+        "fingerprints": sorted({entry_fingerprint(entry)
+                                for entry in entries}),
+    }
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+
+def fingerprints_at_ref(root: Path, ref: str, glob: str) -> Set[str]:
+    package_dir = "data/catalog/packages"
+    listing = subprocess.run(
+        ["git", "-C", str(root), "ls-tree", "--name-only", ref,
+         f"{package_dir}/"],
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        check=True,
+    )
+    fingerprints: Set[str] = set()
+    for name in listing.stdout.splitlines():
+        if not PurePosixPath(name).match(glob):
+            continue
+        shown = subprocess.run(
+            ["git", "-C", str(root), "show", f"{ref}:{name}"],
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            check=True,
+        )
+        fingerprints.update(
+            entry_fingerprint(entry)
+            for entry in parse_packages(shown.stdout, root / name))
+    return fingerprints
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    shard, sep, total = value.partition("/")
+    if not sep or not shard.strip().isdigit() or not total.strip().isdigit():
+        raise ValueError(f"Invalid shard '{value}'. Expected K/N.")
+    shard_number, shard_count = int(shard), int(total)
+    if shard_count < 1 or not 1 <= shard_number <= shard_count:
+        raise ValueError(
+            f"Invalid shard '{value}'. K must be between 1 and N.")
+    return shard_number, shard_count
+
+
+def shard_of(entry: PackageEntry, shard_count: int) -> int:
+    # Hash the manager identifier rather than the catalog id so entries that
+    # coalesce into one check always land on the same shard.
+    identifier = extract_manager_identifier(entry) or entry.package_id
+    key = f"{manager_key(entry)}:{identifier.lower()}"
+    digest = hashlib.sha256(key.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % shard_count + 1
+
+
+def filter_shard(entries: Iterable[PackageEntry], shard_number: int,
+                 shard_count: int) -> List[PackageEntry]:
+    return [
+        entry for entry in entries
+        if shard_of(entry, shard_count) == shard_number
+    ]
+
+
+def compute_exit_code(results: Sequence[CheckResult], strict: bool) -> int:
+    has_failure = any(res.status in FAILURE_STATUSES for res in results)
+    if strict:
+        has_failure = has_failure or any(res.status in {"skipped", "deferred"}
+                                         for res in results)
+    return 1 if has_failure else 0
+
+
+def filter_changed_entries(entries: Iterable[PackageEntry],
+                           baseline: Set[str]) -> List[PackageEntry]:
+    return [
+        entry for entry in entries
+        if entry_fingerprint(entry) not in baseline
+    ]
+
+
 def main(argv: Optional[Sequence[str]] = None) -> int:
+    run_started = time.monotonic()
     args = parse_args(argv)
+    try:
+        cassette = open_cassette(args.record_cassette, args.replay_cassette,
+                                 args.replay_latency)
+    except (OSError, ValueError, KeyError) as exc:
+        print(f"Failed to open cassette: {exc}", file=sys.stderr)
+        return 1
+    with profiling(args.profile), tracing(args.trace_out), \
+            memory_report(args.memory_report), using_cassette(cassette):
+        return run_availability_checks(args, run_started)
+
+
+def report_no_entries(args: argparse.Namespace, message: str) -> None:
+    # Machine formats must stay parseable, so they get an empty result set
+    # and the note goes to stderr.
+    if args.format == "json":
+        print(message, file=sys.stderr)
+        render_results_json([], args.root)
+    elif args.format == "jsonl":
+        print(message, file=sys.stderr)
+    else:
+        print(message)
 
+
+def run_availability_checks(args: argparse.Namespace,
+                            run_started: float) -> int:
     package_files = list(iter_package_files(args.root, args.glob))
     if not package_files:
         print("No catalog files matched the provided glob.", file=sys.stderr)
         return 1
 
-    entries = load_packages(package_files)
+    with phase("load"):
+        entries = load_packages(package_files)
+    memory_checkpoint("load")
     entries = filter_entries(entries, args.managers, args.package_ids)
     if not entries:
-        print("No catalog entries matched the provided filters.")
+        report_no_entries(args,
+                          "No catalog entries matched the provided filters.")
         return 0
+    if args.shard:
+        try:
+            shard_number, shard_count = parse_shard(args.shard)
+        except ValueError as exc:
+            print(str(exc), file=sys.stderr)
+            return 1
+        entries = filter_shard(entries, shard_number, shard_count)
+        if not entries:
+            report_no_entries(
+                args, f"No catalog entries fall into shard {args.shard}.")
+            return 0
+    all_entries = entries
+
+    baseline: Optional[Set[str]] = None
+    try:
+        if args.changed_since_manifest:
+            baseline = load_fingerprint_manifest(args.changed_since_manifest)
+        if args.changed_since:
+            ref_fingerprints = fingerprints_at_ref(args.root,
+                                                   args.changed_since,
+                                                   args.glob)
+            baseline = ref_fingerprints if baseline is None else (
+                baseline | ref_fingerprints)
+    except (OSError, ValueError) as exc:
+        print(f"Failed to load baseline fingerprints: {exc}", file=sys.stderr)
+        return 1
+    except subprocess.CalledProcessError as exc:
+        print(
+            f"Failed to read catalog at {args.changed_since}: {(exc.stderr or '').strip()}",
+            file=sys.stderr)
+        return 1
+    if baseline is not None:
+        entries = filter_changed_entries(entries, baseline)
+        if not entries:
+            report_no_entries(
+                args, "No catalog entries changed relative to the baseline.")
+            if args.write_manifest:
+                write_fingerprint_manifest(args.write_manifest, all_entries)
+            return 0
+
+    if args.jobs < 1:
+        print("--jobs must be at least 1.", file=sys.stderr)
+        return 1
+    if args.retries < 0:
+        print("--retries must not be negative.", file=sys.stderr)
+        return 1
+    if args.resume and not args.journal:
+        print("--resume requires --journal.", file=sys.stderr)
+        return 1
+    if args.adaptive and args.backend != "thread":
+        print("--adaptive is only supported with the thread backend.",
+              file=sys.stderr)
+        return 1
+    if args.warm_shell > 0 and args.backend != "thread":
+        print("--warm-shell is only supported with the thread backend.",
+              file=sys.stderr)
+        return 1
+    try:
+        manager_limits = parse_manager_limits(args.manager_concurrency)
+    except ValueError as exc:
+        print(str(exc), file=sys.stderr)
+        return 1
 
-    total = len(entries)
-    results: List[CheckResult] = []
     # Provide a minimal progress indicator so long runs show activity.
     show_progress = args.format == "table"
-    for index, entry in enumerate(entries, start=1):
-        prefix = f"[{index}/{total}]"
-        line = ""
+
+    index_ids: Set[str] = set()
+    if args.winget_index:
+        try:
+            index_ids = load_winget_index(args.winget_index)
+        except (OSError, ValueError, sqlite3.Error,
+                zipfile.BadZipFile) as exc:
+            print(f"Failed to load winget index: {exc}", file=sys.stderr)
+            return 1
+    if args.scoop_buckets and not args.scoop_buckets.is_dir():
+        print(f"Scoop buckets directory not found: {args.scoop_buckets}",
+              file=sys.stderr)
+        return 1
+
+    resolved: Dict[int, CheckResult] = {}
+    stream = JsonLinesWriter(args.root) if args.format == "jsonl" else None
+
+    journal: Optional[CheckpointJournal] = None
+    resumed: Set[int] = set()
+    if args.journal:
+        if args.resume:
+            recorded = load_journal(args.journal)
+            for position, entry in enumerate(entries):
+                raw = recorded.get(entry_key(entry, args.root))
+                if raw is not None:
+                    resolved[position] = result_from_record(entry, raw)
+                    resumed.add(position)
+            if show_progress and resumed:
+                print(f"Resumed {len(resumed)} entries from {args.journal}.")
+        try:
+            journal = CheckpointJournal(args.journal, args.root,
+                                        append=args.resume)
+        except OSError as exc:
+            print(f"Failed to open checkpoint journal: {exc}",
+                  file=sys.stderr)
+            return 1
+        journal.mark_written(resumed)
+
+    def sync_outputs() -> None:
+        if stream:
+            stream.sync(resolved)
+        if journal:
+            journal.sync(resolved)
+
+    cache: Optional[ResultCache] = None
+    # Cassette runs bypass the cache: a recording must spawn every command,
+    # and a replay must neither read live rows nor leave its answers behind.
+    use_cache = not (args.no_cache or args.record_cassette
+                     or args.replay_cassette)
+    if use_cache:
+        try:
+            cache = ResultCache(args.cache_dir / "availability.sqlite3",
+                                ttl_ok=args.cache_ttl_ok * 3600,
+                                ttl_not_found=args.cache_ttl_not_found * 3600)
+        except (OSError, sqlite3.Error) as exc:
+            print(f"Result cache unavailable: {exc}", file=sys.stderr)
+    if cache and not args.refresh:
+        for position, entry in enumerate(entries):
+            if position in resolved:
+                continue
+            cached_result = cache.lookup(entry)
+            if cached_result:
+                resolved[position] = cached_result
+        if show_progress and cache.hits:
+            print(f"Served {cache.hits} entries from the result cache.")
+    sync_outputs()
+
+    if args.choco_source:
+        count = apply_resolver(
+            entries, resolved,
+            lambda pending: resolve_choco_batch(pending, args.choco_source,
+                                                args.choco_batch_size,
+                                                args.timeout))
         if show_progress:
-            line = f"{prefix} Checking {entry.package_id} ({entry.manager})..."
-            print(line, end="", flush=True)
-        result = check_package(entry, args.timeout)
-        status_label = result.status.upper()
+            print(f"Resolved {count} choco entries in bulk.")
+        sync_outputs()
+
+    if args.winget_index:
+        count = apply_resolver(
+            entries, resolved,
+            lambda pending: resolve_winget_index(pending, index_ids))
+        if show_progress:
+            print(f"Resolved {count} winget entries from the source index.")
+        sync_outputs()
+
+    if args.scoop_buckets:
+        bucket_index = load_scoop_bucket_index(
+            args.scoop_buckets, args.cache_dir / "scoop-buckets.json")
+        count = apply_resolver(
+            entries, resolved,
+            lambda pending: resolve_scoop_index(pending, bucket_index))
         if show_progress:
-            final_line = f"{prefix} {entry.package_id} -> {status_label}"
-            padding = " " * max(0, len(line) - len(final_line))
-            print(f"\r{final_line}{padding}", flush=True)
-        results.append(result)
+            print(f"Resolved {count} scoop entries from local buckets.")
+        sync_outputs()
+
+    pending = [
+        position for position in range(len(entries))
+        if position not in resolved
+    ]
+    breaker = CircuitBreaker(args.breaker_threshold)
+    if not args.no_preflight:
+        for key in sorted({manager_key(entries[position])
+                           for position in pending}):
+            reason = probe_manager(key, args.timeout)
+            if reason:
+                breaker.trip(key, f"preflight failed: {reason}")
+                if show_progress:
+                    print(f"Preflight: {key} unavailable ({reason})")
+
+    shell_pool: Optional[PowerShellHostPool] = None
+    if args.warm_shell > 0 and args.shell_host_command:
+        # A custom host (such as tools/fake_powershell_host.py) takes every
+        # manager found on PATH, so the pool can be exercised without pwsh.
+        shell_pool = PowerShellHostPool(args.warm_shell,
+                                        shlex.split(args.shell_host_command),
+                                        shutil.which)
+    elif args.warm_shell > 0:
+        host_command = default_powershell_host_command()
+        if host_command:
+            shell_pool = PowerShellHostPool(args.warm_shell, host_command)
+        else:
+            print("--warm-shell ignored: neither pwsh nor powershell is on PATH.",
+                  file=sys.stderr)
+    pending_entries = [entries[position] for position in pending]
+    if args.no_coalesce:
+        groups = [[local] for local in range(len(pending_entries))]
+    else:
+        groups = group_duplicate_checks(pending_entries)
+        saved = len(pending_entries) - len(groups)
+        if show_progress and saved:
+            print(f"Coalesced {saved} entries that share a manager identifier.")
+
+    def publish(group_position: int, result: CheckResult) -> None:
+        group = groups[group_position]
+        positions = [pending[local] for local in group]
+        resolved[positions[0]] = result
+        for local in group[1:]:
+            resolved[pending[local]] = fan_out_result(result,
+                                                      pending_entries[local])
+        for writer in (stream, journal):
+            if writer:
+                writer.write_positions(resolved, positions)
+
+    history = RunHistory(args.history) if args.history else None
+    if history:
+        groups.sort(
+            key=lambda group: history.priority(pending_entries[group[0]]))
+
+    gates: List[CheckGate] = [breaker.short_circuit]
+    if args.time_budget is not None:
+        gates.append(TimeBudget(args.time_budget, run_started).short_circuit)
+    elapsed_by_entry: Dict[PackageEntry, float] = {}
+
+    def record_elapsed(entry: PackageEntry, result: CheckResult,
+                       elapsed: float) -> None:
+        elapsed_by_entry[entry] = elapsed
+
+    try:
+        execute_checks([pending_entries[group[0]] for group in groups], args,
+                       manager_limits, show_progress, shell_pool, gates,
+                       [breaker.observe, record_elapsed], publish)
+    finally:
+        if shell_pool:
+            shell_pool.close()
+        if journal:
+            journal.close()
+    results = [resolved[position] for position in range(len(entries))]
+    memory_checkpoint("checking")
+    if cache:
+        # Only cache answers from the managers themselves; bulk resolvers may
+        # read stand-in sources that do not speak for the real manager.
+        try:
+            cache.store(results[position] for position in pending)
+        except sqlite3.Error as exc:
+            print(f"Failed to update result cache: {exc}", file=sys.stderr)
+        cache.close()
+
+    if args.write_manifest:
+        write_fingerprint_manifest(args.write_manifest, all_entries)
+
+    if history:
+        for position, result in enumerate(results):
+            if position not in resumed and not result.cached:
+                history.update(result, elapsed_by_entry.get(result.entry))
+        try:
+            history.save()
+        except OSError as exc:
+            print(f"Failed to write run history: {exc}", file=sys.stderr)
 
     if show_progress:
         print()
-    if args.format == "json":
-        render_results_json(results, args.root)
-    else:
-        render_results(results, args.root)
+    with phase("render"):
+        if args.format == "json":
+            render_results_json(results, args.root)
+        elif args.format == "table":
+            render_results(results, args.root)
+    memory_checkpoint("rendering")
 
-    has_failure = any(res.status in {"not-found", "error"} for res in results)
-    if args.strict:
-        has_failure = has_failure or any(res.status == "skipped"
-                                         for res in results)
+    if args.metrics_out:
+        metrics = render_openmetrics(results,
+                                     time.monotonic() - run_started,
+                                     cache is not None)
+        try:
+            write_text_atomic(args.metrics_out, metrics)
+        except OSError as exc:
+            print(f"Failed to write metrics: {exc}", file=sys.stderr)
 
-    return 1 if has_failure else 0
+    return compute_exit_code(results, args.strict)
 
 
 if __name__ == "__main__":
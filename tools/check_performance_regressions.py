@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from benchmark_catalog_parsers import (build_benchmarks, load_captures,
+                                       load_winget_listing, measure)
+from benchmark_catalog_tools import (benchmark_check, fake_cli_environment,
+                                     write_benchmark_catalog)
+from check_package_availability import iter_package_files, load_packages
+from fake_package_cli import FakeCliSettings, install_fake_clis
+
+BASELINE_VERSION = 1
+
+# Scale factor that turns a median absolute deviation into a standard
+# deviation estimate for normally distributed samples.
+MAD_TO_SIGMA = 1.4826
+
+END_TO_END_SIZE = 100
+END_TO_END_WORKERS = 4
+END_TO_END_SETTINGS = FakeCliSettings(latency=0.01,
+                                      jitter=0.0,
+                                      output_bytes=256,
+                                      failure_ratio=0.02,
+                                      not_found_ratio=0.1)
+
+
+@dataclass(frozen=True)
+class Comparison:
+    name: str
+    unit: str
+    baseline: float
+    current: float
+    noise: float
+    change: float
+    regressed: bool
+
+
+def parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=
+        "Record performance baselines for the catalog tools and fail on significant slowdowns."
+    )
+    parser.add_argument(
+        "--root",
+        type=Path,
+        default=Path(__file__).resolve().parents[1],
+        help="Repository root (defaults to project root)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=7,
+        help="Samples collected per benchmark (defaults to 7).",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record = subparsers.add_parser(
+        "record", help="Measure the benchmarks and write a baseline file.")
+    record.add_argument(
+        "--output",
+        type=Path,
+        required=True,
+        help="Baseline JSON file to write.",
+    )
+
+    compare = subparsers.add_parser(
+        "compare", help="Measure the benchmarks and compare to a baseline.")
+    compare.add_argument(
+        "--baseline",
+        type=Path,
+        required=True,
+        help="Baseline JSON file written by the record command.",
+    )
+    compare.add_argument(
+        "--current",
+        type=Path,
+        default=None,
+        help="Compare a previously recorded file instead of measuring now.",
+    )
+    compare.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help=
+        "Relative slowdown of the median tolerated before failing (defaults to 0.10).",
+    )
+    compare.add_argument(
+        "--sigma",
+        type=float,
+        default=3.0,
+        help=
+        "Slowdowns must also exceed this many MAD-derived standard deviations (defaults to 3).",
+    )
+    return parser.parse_args(argv)
+
+
+def sample_load_packages(root: Path, repeat: int) -> List[float]:
+    package_files = list(iter_package_files(root, "*.yml"))
+    samples: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        load_packages(package_files)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def sample_score_candidates(root: Path, repeat: int) -> List[float]:
+    entries = load_packages(list(iter_package_files(root, "*.yml")))
+    capture_dir = root / "debug"
+    captures = load_captures(capture_dir)
+    winget_output = load_winget_listing(capture_dir)
+    for benchmark in build_benchmarks(entries, captures, winget_output):
+        if benchmark.name == "score_candidates":
+            result = measure(benchmark, repeat, min_time=0.2)
+            return [sample / 1e9 for sample in result.rounds]
+    raise ValueError("score_candidates benchmark is not defined")
+
+
+def sample_end_to_end(root: Path, repeat: int) -> List[float]:
+    with tempfile.TemporaryDirectory(prefix="catalog-gate-") as temp:
+        temp_dir = Path(temp)
+        bin_dir = temp_dir / "bin"
+        install_fake_clis(bin_dir)
+        catalog_root = temp_dir / "catalog"
+        write_benchmark_catalog(catalog_root, END_TO_END_SIZE)
+        work_dir = temp_dir / "work"
+        work_dir.mkdir()
+        with fake_cli_environment(bin_dir, END_TO_END_SETTINGS):
+            result = benchmark_check(catalog_root, END_TO_END_SIZE,
+                                     END_TO_END_WORKERS, "thread", repeat,
+                                     work_dir)
+    return result.samples
+
+
+BENCHMARKS: Dict[str, Callable[[Path, int], List[float]]] = {
+    "load_packages": sample_load_packages,
+    "score_candidates": sample_score_candidates,
+    "end_to_end_check": sample_end_to_end,
+}
+
+
+def median_absolute_deviation(samples: Sequence[float]) -> float:
+    center = statistics.median(samples)
+    return statistics.median(abs(sample - center) for sample in samples)
+
+
+def summarize(samples: Sequence[float]) -> Dict[str, object]:
+    return {
+        "unit": "seconds",
+        "samples": [round(sample, 9) for sample in samples],
+        "median": round(statistics.median(samples), 9),
+        "mad": round(median_absolute_deviation(samples), 9),
+    }
+
+
+def run_benchmarks(root: Path, repeat: int) -> Dict[str, object]:
+    benchmarks: Dict[str, object] = {}
+    for name, sampler in BENCHMARKS.items():
+        print(f"Measuring {name}...", file=sys.stderr)
+        benchmarks[name] = summarize(sampler(root, repeat))
+    return {
+        "version": BASELINE_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "repeat": repeat,
+        "benchmarks": benchmarks,
+    }
+
+
+def load_baseline(path: Path) -> Dict[str, object]:
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(payload, dict):
+        raise ValueError(f"{path} does not contain a baseline object")
+    version = payload.get("version")
+    if version != BASELINE_VERSION:
+        raise ValueError(f"{path} has baseline version {version}; "
+                         f"expected {BASELINE_VERSION}. Re-record it.")
+    return payload
+
+
+def compare_benchmark(name: str, baseline: Dict[str, object],
+                      current: Dict[str, object], threshold: float,
+                      sigma: float) -> Comparison:
+    base_median = float(baseline["median"])
+    current_median = float(current["median"])
+    noise = MAD_TO_SIGMA * max(float(baseline["mad"]), float(current["mad"]))
+    delta = current_median - base_median
+    change = delta / base_median if base_median else 0.0
+    # A slowdown only counts when it is both larger than the tolerated
+    # relative change and clearly outside the run-to-run noise.
+    regressed = change > threshold and delta > sigma * noise
+    return Comparison(name, str(current.get("unit", "seconds")), base_median,
+                      current_median, noise, change, regressed)
+
+
+def render_comparisons(comparisons: Sequence[Comparison]) -> None:
+    print(f"{'BENCHMARK':<20} {'BASELINE':>12} {'CURRENT':>12} "
+          f"{'CHANGE':>9} {'NOISE':>12}  VERDICT")
+    for item in comparisons:
+        verdict = "REGRESSED" if item.regressed else "ok"
+        print(f"{item.name:<20} {item.baseline:>12.6f} {item.current:>12.6f} "
+              f"{item.change:>+8.1%} {item.noise:>12.6f}  {verdict}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.repeat < 3:
+        print("--repeat must be at least 3 for a MAD estimate.",
+              file=sys.stderr)
+        return 1
+
+    if args.command == "record":
+        payload = run_benchmarks(args.root, args.repeat)
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(payload, indent=2) + "\n",
+                               encoding="utf-8")
+        print(f"Wrote baseline for {len(payload['benchmarks'])} benchmarks "
+              f"to {args.output}")
+        return 0
+
+    try:
+        baseline = load_baseline(args.baseline)
+        if args.current:
+            current = load_baseline(args.current)
+        else:
+            current = run_benchmarks(args.root, args.repeat)
+    except (OSError, ValueError) as exc:
+        print(f"Failed to load baseline: {exc}", file=sys.stderr)
+        return 1
+
+    comparisons: List[Comparison] = []
+    base_benchmarks = baseline.get("benchmarks", {})
+    current_benchmarks = current.get("benchmarks", {})
+    for name in BENCHMARKS:
+        if name not in base_benchmarks or name not in current_benchmarks:
+            print(f"{name}: missing from baseline or current run; skipped.",
+                  file=sys.stderr)
+            continue
+        comparisons.append(
+            compare_benchmark(name, base_benchmarks[name],
+                              current_benchmarks[name], args.threshold,
+                              args.sigma))
+
+    render_comparisons(comparisons)
+    regressions = [item.name for item in comparisons if item.regressed]
+    if regressions:
+        print(f"\nSignificant slowdown in: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
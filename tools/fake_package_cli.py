@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Offline stand-ins for winget, choco and scoop. install_fake_clis() writes
+# wrapper executables named after the real CLIs so shutil.which (and with it
+# _prepare_command) resolves them exactly like the real managers. Behaviour
+# is tuned through FAKE_CLI_* environment variables; a FAKE_CLI_<MANAGER>_*
+# variable overrides the global one for a single manager.
+
+FAKE_MANAGERS = ("winget", "choco", "scoop")
+
+WINGET_NOT_FOUND_CODE = 0x8A150014 & 0xFF
+FAILURE_CODE = 2
+
+
+@dataclass(frozen=True)
+class FakeCliSettings:
+    latency: float = 0.05
+    jitter: float = 0.0
+    output_bytes: int = 0
+    failure_ratio: float = 0.0
+    not_found_ratio: float = 0.1
+    seed: int = 0
+
+
+def _setting(manager: str, name: str) -> Optional[str]:
+    specific = os.environ.get(f"FAKE_CLI_{manager.upper()}_{name}")
+    if specific is not None:
+        return specific
+    return os.environ.get(f"FAKE_CLI_{name}")
+
+
+def load_settings(manager: str) -> FakeCliSettings:
+    defaults = FakeCliSettings()
+
+    def number(name: str, default: float) -> float:
+        value = _setting(manager, name)
+        return float(value) if value not in (None, "") else default
+
+    return FakeCliSettings(
+        latency=number("LATENCY", defaults.latency),
+        jitter=number("JITTER", defaults.jitter),
+        output_bytes=int(number("OUTPUT_BYTES", defaults.output_bytes)),
+        failure_ratio=number("FAILURE_RATIO", defaults.failure_ratio),
+        not_found_ratio=number("NOT_FOUND_RATIO", defaults.not_found_ratio),
+        seed=int(number("SEED", defaults.seed)),
+    )
+
+
+def settings_environment(settings: FakeCliSettings) -> Dict[str, str]:
+    return {
+        "FAKE_CLI_LATENCY": str(settings.latency),
+        "FAKE_CLI_JITTER": str(settings.jitter),
+        "FAKE_CLI_OUTPUT_BYTES": str(settings.output_bytes),
+        "FAKE_CLI_FAILURE_RATIO": str(settings.failure_ratio),
+        "FAKE_CLI_NOT_FOUND_RATIO": str(settings.not_found_ratio),
+        "FAKE_CLI_SEED": str(settings.seed),
+    }
+
+
+def classify(manager: str, identifier: str, settings: FakeCliSettings) -> str:
+    # Outcomes hash the identifier rather than drawing from a shared RNG so
+    # every run of the same catalog sees the same failures and misses.
+    digest = zlib.crc32(f"{settings.seed}:{manager}:{identifier.lower()}".
+                        encode("utf-8"))
+    draw = digest / 0xFFFFFFFF
+    if draw < settings.failure_ratio:
+        return "error"
+    if draw < settings.failure_ratio + settings.not_found_ratio:
+        return "not-found"
+    return "ok"
+
+
+def _padding(lines: List[str], target: int, filler: str) -> List[str]:
+    size = sum(len(line) + 1 for line in lines)
+    index = 0
+    while size < target:
+        line = f"{filler} {index}"
+        lines.append(line)
+        size += len(line) + 1
+        index += 1
+    return lines
+
+
+def _positional(arguments: Sequence[str]) -> List[str]:
+    values: List[str] = []
+    iterator = iter(arguments)
+    for argument in iterator:
+        if argument == "--source":
+            next(iterator, None)
+        elif not argument.startswith("-"):
+            values.append(argument)
+    return values
+
+
+def _winget(arguments: Sequence[str],
+            settings: FakeCliSettings) -> Tuple[int, List[str], List[str]]:
+    values = _positional(arguments)
+    verb = values[0] if values else ""
+    identifier = values[1] if len(values) > 1 else ""
+    outcome = classify("winget", identifier, settings)
+    if outcome == "error":
+        return FAILURE_CODE, [], ["An unexpected error occurred while "
+                                  "executing the command: 0x8a15000f"]
+    if outcome == "not-found":
+        return WINGET_NOT_FOUND_CODE, [
+            "No package found matching input criteria."
+        ], []
+    if verb == "search":
+        lines = [
+            "Name                 Id                          Version  Source",
+            "-" * 66,
+        ]
+        for suffix in ("", ".Preview", ".Portable"):
+            lines.append(f"{identifier}{suffix}  Fake.{identifier}{suffix}  "
+                         "1.0.0  winget")
+        return 0, _padding(lines, settings.output_bytes,
+                           f"{identifier}.Extra  Fake.{identifier}.Extra  "
+                           "1.0.0  winget"), []
+    lines = [
+        f"Found {identifier} [{identifier}]",
+        "Version: 1.0.0",
+        "Publisher: Fake Publisher",
+        "Description:",
+    ]
+    return 0, _padding(lines, settings.output_bytes, "  filler text"), []
+
+
+def _choco(arguments: Sequence[str],
+           settings: FakeCliSettings) -> Tuple[int, List[str], List[str]]:
+    values = _positional(arguments)
+    identifier = values[1] if len(values) > 1 else ""
+    outcome = classify("choco", identifier, settings)
+    if outcome == "error":
+        return FAILURE_CODE, [], ["Chocolatey could not reach the source."]
+    if outcome == "not-found":
+        return 0, ["0 packages found."], []
+    if "--id-only" in arguments:
+        lines = [identifier]
+        filler = f"{identifier}.extension"
+    else:
+        lines = [f"{identifier}|1.0.0", f"{identifier}.install|1.0.0"]
+        filler = f"{identifier}.portable|1.0.0"
+    return 0, _padding(lines, settings.output_bytes, filler), []
+
+
+def _scoop(arguments: Sequence[str],
+           settings: FakeCliSettings) -> Tuple[int, List[str], List[str]]:
+    values = _positional(arguments)
+    identifier = values[1] if len(values) > 1 else ""
+    outcome = classify("scoop", identifier, settings)
+    if outcome == "error":
+        return FAILURE_CODE, [], ["ERROR: Failed to update buckets."]
+    if outcome == "not-found":
+        return 0, ["WARN  No matches found."], []
+    lines = [
+        "Results from local buckets...",
+        "",
+        "Name     Version Source Binaries",
+        "----     ------- ------ --------",
+        f"{identifier}  1.0.0  main",
+    ]
+    return 0, _padding(lines, settings.output_bytes,
+                       f"{identifier}-extras  1.0.0  extras"), []
+
+
+HANDLERS = {
+    "winget": _winget,
+    "choco": _choco,
+    "scoop": _scoop,
+}
+
+
+def run_fake_cli(manager: str, arguments: Sequence[str]) -> int:
+    settings = load_settings(manager)
+    rng = random.Random(f"{settings.seed}:{manager}:{' '.join(arguments)}")
+    delay = settings.latency + rng.uniform(0.0, settings.jitter)
+    if delay > 0:
+        time.sleep(delay)
+
+    if arguments and arguments[0] in ("--version", "-v"):
+        print("1.0.0")
+        return 0
+    code, stdout, stderr = HANDLERS[manager](arguments, settings)
+    if stdout:
+        print("\n".join(stdout))
+    if stderr:
+        print("\n".join(stderr), file=sys.stderr)
+    return code
+
+
+def install_fake_clis(bin_dir: Path) -> List[Path]:
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    script = Path(__file__).resolve()
+    written: List[Path] = []
+    for manager in FAKE_MANAGERS:
+        if sys.platform.startswith("win"):
+            path = bin_dir / f"{manager}.cmd"
+            path.write_text(
+                f'@"{sys.executable}" "{script}" {manager} %*\r\n',
+                encoding="utf-8")
+        else:
+            path = bin_dir / manager
+            path.write_text(
+                f'#!/bin/sh\nexec "{sys.executable}" "{script}" '
+                f'{manager} "$@"\n',
+                encoding="utf-8")
+            path.chmod(0o755)
+        written.append(path)
+    return written
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    arguments = list(sys.argv[1:] if argv is None else argv)
+    if arguments and arguments[0] in FAKE_MANAGERS:
+        return run_fake_cli(arguments[0], arguments[1:])
+
+    parser = argparse.ArgumentParser(
+        description=
+        "Install offline winget/choco/scoop stand-ins for benchmarks, or run one "
+        "directly as '<manager> ARGS...'.")
+    parser.add_argument("install_dir",
+                        type=Path,
+                        help="Directory to write the stub executables to.")
+    args = parser.parse_args(arguments)
+    for path in install_fake_clis(args.install_dir):
+        print(path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
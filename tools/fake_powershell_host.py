@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from typing import Dict, Optional, Sequence
+
+# Scripted stand-in for the warm PowerShell host started by --warm-shell. It
+# speaks the same line protocol as POWERSHELL_HOST_BOOTSTRAP: one JSON request
+# per stdin line, one prefixed JSON response per stdout line. Point
+# check_package_availability.py at it with --shell-host-command to exercise
+# the host pool (framing, timeouts, restarts) on platforms without pwsh.
+
+FRAME_PREFIX = "@@TIDYWINDOW-HOST@@ "
+
+
+def parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=
+        "Stand-in for the warm PowerShell host; runs each requested script as a plain executable."
+    )
+    parser.add_argument(
+        "--banner",
+        action="store_true",
+        help="Print unframed console noise at startup and around each answer.",
+    )
+    parser.add_argument(
+        "--exit-after",
+        type=int,
+        default=0,
+        metavar="N",
+        help=
+        "Exit without answering the request after N answered ones, as a crashed host would.",
+    )
+    return parser.parse_args(argv)
+
+
+def run_request(request: Dict[str, object]) -> Dict[str, object]:
+    arguments = [str(argument) for argument in request.get("arguments") or []]
+    try:
+        completed = subprocess.run(
+            [str(request["script"]), *arguments],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            check=False,
+        )
+    except OSError as exc:
+        return {"id": request.get("id"), "exitCode": 1, "output": str(exc)}
+    return {
+        "id": request.get("id"),
+        "exitCode": completed.returncode,
+        "output": completed.stdout or "",
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.banner:
+        print("PowerShell 7.4.0 (stand-in)", flush=True)
+    answered = 0
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        if args.exit_after and answered >= args.exit_after:
+            return 1
+        try:
+            request = json.loads(line)
+        except ValueError:
+            continue
+        response = run_request(request)
+        if args.banner:
+            print(f"WARNING: running {request.get('script')}", flush=True)
+        print(FRAME_PREFIX + json.dumps(response), flush=True)
+        answered += 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
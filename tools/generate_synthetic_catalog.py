@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import collections
+import json
+import random
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (Deque, Dict, Iterator, List, Optional, Sequence, TextIO,
+                    Tuple)
+
+from check_package_availability import iter_package_files
+
+try:
+    import yaml  # type: ignore
+except ModuleNotFoundError as exc:
+    print(
+        "PyYAML is required to run this script. Install it with 'pip install pyyaml'.",
+        file=sys.stderr,
+    )
+    raise SystemExit(1) from exc
+
+MIN_ENTRIES = 1
+MAX_ENTRIES = 1_000_000
+
+MANAGERS = ("winget", "choco", "scoop")
+MANAGER_ALIASES = {"chocolatey": "choco"}
+SCOOP_BUCKETS = ("main", "extras", "versions")
+
+# Recently generated entries that duplicates and near-duplicates copy from;
+# bounded so a million-entry run does not keep every entry alive.
+DUPLICATE_POOL_SIZE = 10_000
+
+PLAIN_SCALAR = re.compile(r"[A-Za-z0-9][A-Za-z0-9 .+_()/-]*")
+
+
+@dataclass(frozen=True)
+class CatalogMix:
+    manager_weights: Tuple[Tuple[str, int], ...]
+    requires_admin_ratio: float
+    choco_version_pin_ratio: float
+    winget_silent_ratio: float
+
+
+@dataclass(frozen=True)
+class SyntheticEntry:
+    package_id: str
+    name: str
+    manager: str
+    identifier: str
+    requires_admin: bool
+    tags: Sequence[str]
+    summary: str
+    homepage: str
+    version: Optional[str] = None
+    silent: bool = False
+    buckets: Sequence[str] = ()
+
+
+def parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=
+        "Generate a synthetic package catalog shaped like data/catalog/packages for scale testing."
+    )
+    parser.add_argument(
+        "output_root",
+        type=Path,
+        help=
+        "Root to write into; catalogs land in OUTPUT_ROOT/data/catalog/packages so tools accept --root OUTPUT_ROOT.",
+    )
+    parser.add_argument(
+        "--entries",
+        type=int,
+        default=1000,
+        help=f"Number of entries to generate ({MIN_ENTRIES}-{MAX_ENTRIES}, defaults to 1000).",
+    )
+    parser.add_argument(
+        "--entries-per-file",
+        type=int,
+        default=1000,
+        help="Entries written to each YAML file (defaults to 1000).",
+    )
+    parser.add_argument(
+        "--duplicate-rate",
+        type=float,
+        default=0.01,
+        help="Share of entries that repeat an earlier package id (defaults to 0.01).",
+    )
+    parser.add_argument(
+        "--near-duplicate-rate",
+        type=float,
+        default=0.02,
+        help=
+        "Share of entries whose id is a variant of an earlier one for the same package (defaults to 0.02).",
+    )
+    parser.add_argument(
+        "--template-root",
+        type=Path,
+        default=Path(__file__).resolve().parents[1],
+        help=
+        "Repository whose catalog supplies names, tags and summaries (defaults to project root).",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Random seed; the same seed and options produce the same catalog.",
+    )
+    return parser.parse_args(argv)
+
+
+def load_templates(root: Path) -> List[Dict[str, object]]:
+    templates: List[Dict[str, object]] = []
+    for path in iter_package_files(root, "*.yml"):
+        raw = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+        for pkg in raw.get("packages", []):
+            if isinstance(pkg, dict) and pkg.get("id") and pkg.get("name"):
+                templates.append(pkg)
+    return templates
+
+
+def _ratio(count: int, total: int) -> float:
+    return count / total if total else 0.0
+
+
+def measure_mix(templates: Sequence[Dict[str, object]]) -> CatalogMix:
+    managers: Dict[str, int] = collections.Counter()
+    requires_admin = 0
+    choco_pins = 0
+    winget_silent = 0
+    for template in templates:
+        manager = str(template.get("manager", "")).strip().lower()
+        manager = MANAGER_ALIASES.get(manager, manager)
+        if manager not in MANAGERS:
+            continue
+        managers[manager] += 1
+        requires_admin += template.get("requiresAdmin") is True
+        command = str(template.get("command", ""))
+        choco_pins += manager == "choco" and "--version" in command
+        winget_silent += manager == "winget" and "--silent" in command
+    return CatalogMix(
+        manager_weights=tuple((manager, managers[manager])
+                              for manager in MANAGERS if managers[manager]),
+        requires_admin_ratio=_ratio(requires_admin, sum(managers.values())),
+        choco_version_pin_ratio=_ratio(choco_pins, managers["choco"]),
+        winget_silent_ratio=_ratio(winget_silent, managers["winget"]),
+    )
+
+
+def _scalar(value: str) -> str:
+    if PLAIN_SCALAR.fullmatch(value) and not value.endswith(" "):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-") or "package"
+
+
+def _pascal(value: str) -> str:
+    return "".join(part.capitalize()
+                   for part in re.split(r"[^A-Za-z0-9]+", value)
+                   if part) or "Package"
+
+
+def near_duplicate_id(package_id: str, rng: random.Random) -> str:
+    variants = [
+        package_id.replace("-", "."),
+        package_id.replace("-", ""),
+        f"{package_id}-portable",
+        f"{package_id}-lts",
+        package_id.capitalize(),
+        f"{package_id}2",
+    ]
+    candidates = [variant for variant in variants if variant != package_id]
+    return rng.choice(candidates)
+
+
+def generate_entries(count: int, templates: Sequence[Dict[str, object]],
+                     mix: CatalogMix, duplicate_rate: float,
+                     near_duplicate_rate: float,
+                     seed: int) -> Iterator[SyntheticEntry]:
+    rng = random.Random(seed)
+    managers = [manager for manager, _ in mix.manager_weights]
+    weights = [weight for _, weight in mix.manager_weights]
+    pool: Deque[SyntheticEntry] = collections.deque(
+        maxlen=DUPLICATE_POOL_SIZE)
+    for index in range(count):
+        draw = rng.random()
+        if pool and draw < duplicate_rate:
+            yield rng.choice(pool)
+            continue
+        if pool and draw < duplicate_rate + near_duplicate_rate:
+            original = rng.choice(pool)
+            yield SyntheticEntry(
+                package_id=near_duplicate_id(original.package_id, rng),
+                name=original.name,
+                manager=original.manager,
+                identifier=original.identifier,
+                requires_admin=original.requires_admin,
+                tags=original.tags,
+                summary=original.summary,
+                homepage=original.homepage,
+                version=original.version,
+                silent=original.silent,
+                buckets=original.buckets,
+            )
+            continue
+
+        template = templates[index % len(templates)]
+        base_name = str(template.get("name", "Package")).strip()
+        name = f"{base_name} {index}"
+        package_id = f"{_slug(base_name)}-{index}"
+        manager = rng.choices(managers, weights)[0]
+        version: Optional[str] = None
+        silent = False
+        buckets: Sequence[str] = ()
+        if manager == "winget":
+            publisher = _pascal(str(template.get("id", "vendor")))
+            identifier = f"{publisher}.{_pascal(base_name)}{index}"
+            silent = rng.random() < mix.winget_silent_ratio
+        elif manager == "choco":
+            identifier = package_id
+            if rng.random() < mix.choco_version_pin_ratio:
+                version = (f"{rng.randint(1, 30)}.{rng.randint(0, 20)}."
+                           f"{rng.randint(0, 9)}")
+        else:
+            identifier = package_id
+            buckets = (rng.choice(SCOOP_BUCKETS), )
+        raw_tags = template.get("tags") or []
+        tags = tuple(str(tag) for tag in raw_tags) if isinstance(
+            raw_tags, list) else ()
+        entry = SyntheticEntry(
+            package_id=package_id,
+            name=name,
+            manager=manager,
+            identifier=identifier,
+            requires_admin=rng.random() < mix.requires_admin_ratio,
+            tags=tags,
+            summary=str(template.get("summary", "")).strip(),
+            homepage=str(template.get("homepage", "")).strip(),
+            version=version,
+            silent=silent,
+            buckets=buckets,
+        )
+        pool.append(entry)
+        yield entry
+
+
+def build_command(entry: SyntheticEntry) -> str:
+    if entry.manager == "winget":
+        silent = " --silent" if entry.silent else ""
+        return (f"winget install --id {entry.identifier} -e{silent} "
+                "--accept-package-agreements --accept-source-agreements")
+    if entry.manager == "choco":
+        version = f" --version={entry.version}" if entry.version else ""
+        return f"choco install {entry.identifier}{version} -y --no-progress"
+    return f"scoop install {entry.identifier}"
+
+
+def write_entry(handle: TextIO, entry: SyntheticEntry) -> None:
+    lines = [
+        f"    - id: {_scalar(entry.package_id)}",
+        f"      name: {_scalar(entry.name)}",
+        f"      manager: {entry.manager}",
+        f"      command: {json.dumps(build_command(entry))}",
+        f"      requiresAdmin: {'true' if entry.requires_admin else 'false'}",
+    ]
+    if entry.buckets:
+        lines.append("      buckets:")
+        lines.extend(f"          - {bucket}" for bucket in entry.buckets)
+    if entry.summary:
+        lines.append(f"      summary: {_scalar(entry.summary)}")
+    if entry.homepage:
+        lines.append(f"      homepage: {json.dumps(entry.homepage)}")
+    tags = ", ".join(_scalar(tag) for tag in entry.tags)
+    lines.append(f"      tags: [{tags}]")
+    handle.write("\n".join(lines) + "\n")
+
+
+def write_catalog(output_root: Path, entries: Iterator[SyntheticEntry],
+                  entries_per_file: int) -> Dict[str, int]:
+    package_dir = output_root / "data" / "catalog" / "packages"
+    package_dir.mkdir(parents=True, exist_ok=True)
+    stats: Dict[str, int] = collections.Counter()
+    handle: Optional[TextIO] = None
+    try:
+        for position, entry in enumerate(entries):
+            if position % entries_per_file == 0:
+                if handle:
+                    handle.close()
+                path = package_dir / (
+                    f"synthetic-{position // entries_per_file:05d}.yml")
+                handle = path.open("w", encoding="utf-8", newline="\n")
+                handle.write("packages:\n")
+                stats["files"] += 1
+            write_entry(handle, entry)
+            stats["entries"] += 1
+            stats[entry.manager] += 1
+    finally:
+        if handle:
+            handle.close()
+    return stats
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    if not MIN_ENTRIES <= args.entries <= MAX_ENTRIES:
+        print(f"--entries must be between {MIN_ENTRIES} and {MAX_ENTRIES}.",
+              file=sys.stderr)
+        return 1
+    if args.entries_per_file < 1:
+        print("--entries-per-file must be at least 1.", file=sys.stderr)
+        return 1
+    rates = (args.duplicate_rate, args.near_duplicate_rate)
+    if any(rate < 0 for rate in rates) or sum(rates) >= 1:
+        print("Duplicate rates must be non-negative and sum to less than 1.",
+              file=sys.stderr)
+        return 1
+
+    try:
+        templates = load_templates(args.template_root)
+    except (OSError, yaml.YAMLError) as exc:
+        print(f"Failed to read template catalog: {exc}", file=sys.stderr)
+        return 1
+    # The manager and option mix follows the template catalog so synthetic
+    # runs stay representative as the real catalog changes.
+    mix = measure_mix(templates)
+    if not templates or not mix.manager_weights:
+        print("Template catalog has no usable entries.", file=sys.stderr)
+        return 1
+
+    entries = generate_entries(args.entries, templates, mix,
+                               args.duplicate_rate, args.near_duplicate_rate,
+                               args.seed)
+    stats = write_catalog(args.output_root, entries, args.entries_per_file)
+    written = ", ".join(f"{manager}: {stats[manager]}"
+                        for manager, _ in mix.manager_weights)
+    print(f"Wrote {stats['entries']} entries in {stats['files']} files under "
+          f"{args.output_root / 'data' / 'catalog' / 'packages'} ({written}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
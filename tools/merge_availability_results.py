@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from check_package_availability import (
+    CheckResult,
+    JsonLinesWriter,
+    compute_exit_code,
+    entry_from_record,
+    entry_key,
+    render_results,
+    render_results_json,
+    result_from_record,
+)
+
+
+def parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=
+        "Merge per-shard check_package_availability.py outputs into one report."
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        type=Path,
+        help="JSON or JSON Lines outputs produced by --shard runs.",
+    )
+    parser.add_argument(
+        "--root",
+        type=Path,
+        default=Path(__file__).resolve().parents[1],
+        help="Repository root used to resolve catalog paths.",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("table", "json", "jsonl"),
+        default="table",
+        help="Output format (defaults to 'table').",
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Treat skipped packages as failures in the exit code.",
+    )
+    return parser.parse_args(argv)
+
+
+def load_records(path: Path) -> List[Dict[str, object]]:
+    text = path.read_text(encoding="utf-8")
+    if text.lstrip().startswith("["):
+        return list(json.loads(text))
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def merge_results(paths: Sequence[Path], root: Path) -> List[CheckResult]:
+    merged: Dict[Tuple[str, int, str], CheckResult] = {}
+    for path in paths:
+        for raw in load_records(path):
+            entry = entry_from_record(raw, root)
+            # Later inputs win so a re-run shard can replace an earlier one.
+            merged[entry_key(entry, root)] = result_from_record(entry, raw)
+    return [merged[key] for key in sorted(merged)]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+
+    missing = [path for path in args.inputs if not path.is_file()]
+    if missing:
+        for path in missing:
+            print(f"Input not found: {path}", file=sys.stderr)
+        return 1
+
+    try:
+        results = merge_results(args.inputs, args.root)
+    except ValueError as exc:
+        print(f"Failed to parse shard output: {exc}", file=sys.stderr)
+        return 1
+    if not results:
+        print("No results found in the provided inputs.")
+        return 0
+
+    if args.format == "json":
+        render_results_json(results, args.root)
+    elif args.format == "jsonl":
+        writer = JsonLinesWriter(args.root)
+        for result in results:
+            writer.write(result)
+    else:
+        render_results(results, args.root)
+
+    return compute_exit_code(results, args.strict)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,11 +8,17 @@ import re
 import shutil
 import subprocess
 import sys
+import time
 from dataclasses import dataclass
 from difflib import SequenceMatcher
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
+from catalog_cassette import (Cassette, CassetteMiss, open_cassette,
+                              recording_cassette, replaying_cassette,
+                              using_cassette)
+from catalog_diagnostics import (memory_checkpoint, memory_report, phase,
+                                 profiling, trace_span, tracing)
 from check_package_availability import (
     PackageEntry,
     extract_manager_identifier,
@@ -68,7 +74,9 @@ def parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
         "--input",
         type=Path,
         default=None,
-        help="Path to JSON output produced by check_package_availability.py",
+        help=
+        "Path to JSON or JSON Lines output produced by check_package_availability.py; "
+        "'-' streams JSON Lines from stdin.",
     )
     parser.add_argument(
         "--root",
@@ -121,50 +129,105 @@ def parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
         action="store_true",
         help="Suppress suggestion details on stdout.",
     )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="PATH",
+        help=
+        "Write a cProfile dump to PATH and print a per-phase timing breakdown to stderr.",
+    )
+    parser.add_argument(
+        "--trace-out",
+        type=Path,
+        metavar="PATH",
+        help=
+        "Write a Chrome Trace Event JSON file (viewable in Perfetto) with a span per search command.",
+    )
+    parser.add_argument(
+        "--memory-report",
+        action="store_true",
+        help=
+        "Trace allocations and print the top allocation sites and peak RSS to stderr.",
+    )
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument(
+        "--record-cassette",
+        type=Path,
+        metavar="PATH",
+        help=
+        "Record every search command with its output, exit code and latency to PATH.",
+    )
+    cassette_group.add_argument(
+        "--replay-cassette",
+        type=Path,
+        metavar="PATH",
+        help=
+        "Serve search commands from a recorded cassette instead of running them.",
+    )
+    parser.add_argument(
+        "--replay-latency",
+        action="store_true",
+        help="When replaying, sleep for each command's recorded latency.",
+    )
     return parser.parse_args(argv)
 
 
+def parse_result_record(raw: Dict[str, object], root: Path) -> ResultRecord:
+    file_part = str(raw.get("file_path", "") or "")
+    file_path = Path(file_part)
+    if not file_path.is_absolute():
+        file_path = root / file_path
+    entry = PackageEntry(
+        package_id=str(raw.get("package_id", "")),
+        manager=str(raw.get("manager", "")),
+        command=str(raw.get("command", "")),
+        name=str(raw.get("name", "")),
+        file_path=file_path,
+        index=int(raw.get("index", 0) or 0),
+    )
+    return ResultRecord(
+        entry=entry,
+        status=str(raw.get("status", "")),
+        message=str(raw.get("message", "")),
+        manager_identifier=(str(raw.get("manager_identifier") or "")
+                            or None),
+    )
+
+
+def iter_result_lines(lines: Iterable[str],
+                      root: Path) -> Iterator[ResultRecord]:
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield parse_result_record(json.loads(line), root)
+
+
 def load_results(path: Path, root: Path) -> List[ResultRecord]:
-    payload = json.loads(path.read_text(encoding="utf-8"))
-    records: List[ResultRecord] = []
-    for raw in payload:
-        file_part = raw.get("file_path", "")
-        file_path = Path(file_part)
-        if not file_path.is_absolute():
-            file_path = root / file_path
-        entry = PackageEntry(
-            package_id=str(raw.get("package_id", "")),
-            manager=str(raw.get("manager", "")),
-            command=str(raw.get("command", "")),
-            name=str(raw.get("name", "")),
-            file_path=file_path,
-            index=int(raw.get("index", 0)),
-        )
-        records.append(
-            ResultRecord(
-                entry=entry,
-                status=str(raw.get("status", "")),
-                message=str(raw.get("message", "")),
-                manager_identifier=(raw.get("manager_identifier") or None),
-            ))
-    return records
+    text = path.read_text(encoding="utf-8")
+    # Accept both the JSON array and the JSON Lines output formats.
+    if text.lstrip().startswith("["):
+        return [parse_result_record(raw, root) for raw in json.loads(text)]
+    return list(iter_result_lines(text.splitlines(), root))
 
 
-def filter_records(records: Iterable[ResultRecord], managers: Sequence[str],
-                   package_ids: Sequence[str]) -> List[ResultRecord]:
+def record_matches(record: ResultRecord, managers: Sequence[str],
+                   package_ids: Sequence[str]) -> bool:
     manager_filters = {m.lower() for m in managers if m}
     package_filters = {p.lower() for p in package_ids if p}
-    filtered: List[ResultRecord] = []
-    for record in records:
-        entry = record.entry
-        if manager_filters and entry.manager.lower() not in manager_filters:
-            continue
-        if package_filters and entry.package_id.lower() not in package_filters:
-            continue
-        if record.status.lower() not in {"not-found", "error"}:
-            continue
-        filtered.append(record)
-    return filtered
+    entry = record.entry
+    if manager_filters and entry.manager.lower() not in manager_filters:
+        return False
+    if package_filters and entry.package_id.lower() not in package_filters:
+        return False
+    return record.status.lower() in {"not-found", "error"}
+
+
+def filter_records(records: Iterable[ResultRecord], managers: Sequence[str],
+                   package_ids: Sequence[str]) -> List[ResultRecord]:
+    return [
+        record for record in records
+        if record_matches(record, managers, package_ids)
+    ]
 
 
 def resolve_search_managers(search_managers: Sequence[str]) -> List[str]:
@@ -221,25 +284,68 @@ def _prepare_command(command: Sequence[str]) -> List[str]:
 
 
 def run_search_command(command: Sequence[str],
-                       timeout: int) -> Tuple[int, str]:
+                       timeout: int,
+                       query: Optional[str] = None) -> Tuple[int, str]:
+    replay = replaying_cassette()
+    if replay:
+        return replay_search_command(replay, command, timeout)
+    record = recording_cassette()
     prepared = _prepare_command(command)
+    manager = command[0]
+    started = time.perf_counter()
     try:
-        completed = subprocess.run(
-            prepared,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-            timeout=timeout,
-            check=False,
-        )
+        with phase("subprocess"), trace_span(f"{manager} search",
+                                             manager,
+                                             manager=manager,
+                                             query=query) as span:
+            span["status"] = "timeout"
+            try:
+                completed = subprocess.run(
+                    prepared,
+                    capture_output=True,
+                    text=True,
+                    encoding="utf-8",
+                    errors="replace",
+                    timeout=timeout,
+                    check=False,
+                )
+            except FileNotFoundError:
+                span["status"] = "unavailable"
+                raise
+            except subprocess.TimeoutExpired:
+                if record:
+                    record.record(command, "", "", None,
+                                  time.perf_counter() - started,
+                                  timed_out=True)
+                raise
+            span["status"] = "ok" if completed.returncode == 0 else "error"
+            span["return_code"] = completed.returncode
     except FileNotFoundError as exc:
         raise SearchError(
             f"CLI '{command[0]}' is not available on PATH.") from exc
+    if record:
+        record.record(command, completed.stdout or "", completed.stderr or "",
+                      completed.returncode, time.perf_counter() - started)
     combined = (completed.stdout or "") + (completed.stderr or "")
     return completed.returncode, combined
 
 
+def replay_search_command(cassette: Cassette, command: Sequence[str],
+                          timeout: int) -> Tuple[int, str]:
+    try:
+        interaction = cassette.replay(command)
+    except CassetteMiss as exc:
+        raise SearchError(str(exc)) from exc
+    delay = cassette.delay(interaction)
+    if delay:
+        time.sleep(min(delay, timeout))
+    if interaction.timed_out:
+        raise subprocess.TimeoutExpired(list(command), timeout)
+    return_code = interaction.return_code
+    return (return_code if return_code is not None else -1,
+            interaction.stdout + interaction.stderr)
+
+
 def search_winget(query: str, timeout: int) -> List[SearchCandidate]:
     command = [
         "winget",
@@ -250,7 +356,7 @@ def search_winget(query: str, timeout: int) -> List[SearchCandidate]:
         "--disable-interactivity",
         "--accept-source-agreements",
     ]
-    code, output = run_search_command(command, timeout)
+    code, output = run_search_command(command, timeout, query)
     if code != 0 and not output.strip():
         raise SearchError("winget search returned no output")
     return parse_winget_output(output, query)
@@ -295,7 +401,7 @@ def search_choco(query: str, timeout: int) -> List[SearchCandidate]:
         "--no-color",
         "--limit-output",
     ]
-    code, output = run_search_command(command, timeout)
+    code, output = run_search_command(command, timeout, query)
     if "no packages found" in output.lower():
         return []
     if code != 0 and not output.strip():
@@ -322,7 +428,7 @@ def search_choco(query: str, timeout: int) -> List[SearchCandidate]:
 
 def search_scoop(query: str, timeout: int) -> List[SearchCandidate]:
     command = ["scoop", "search", query]
-    code, output = run_search_command(command, timeout)
+    code, output = run_search_command(command, timeout, query)
     normalized = output.lower()
     if "no matches found" in normalized:
         return []
@@ -449,7 +555,8 @@ def search_for_record(
         record: ResultRecord, managers: Sequence[str],
         timeout: int) -> Tuple[List[ScoredSuggestion], List[str]]:
     entry = record.entry
-    queries = gather_queries(record)
+    with phase("extraction"):
+        queries = gather_queries(record)
     scored: List[ScoredSuggestion] = []
     notes: List[str] = []
     for manager in managers:
@@ -475,11 +582,13 @@ def search_for_record(
                 notes.append(
                     f"{manager}: no matches for queries {', '.join(queries)}")
             continue
-        manager_candidates = dedupe_candidates(manager_candidates)
-        scored.extend(
-            score_candidates(entry, record.manager_identifier,
-                             manager_candidates))
-    scored.sort(key=lambda item: item.score, reverse=True)
+        with phase("scoring"):
+            manager_candidates = dedupe_candidates(manager_candidates)
+            scored.extend(
+                score_candidates(entry, record.manager_identifier,
+                                 manager_candidates))
+    with phase("scoring"):
+        scored.sort(key=lambda item: item.score, reverse=True)
     return scored, notes
 
 
@@ -564,17 +673,30 @@ def build_output_record(record: ResultRecord,
 
 def main(argv: Optional[Sequence[str]] = None) -> int:
     args = parse_args(argv)
+    try:
+        cassette = open_cassette(args.record_cassette, args.replay_cassette,
+                                 args.replay_latency)
+    except (OSError, ValueError, KeyError) as exc:
+        print(f"Failed to open cassette: {exc}", file=sys.stderr)
+        return 1
+    with profiling(args.profile), tracing(args.trace_out), \
+            memory_report(args.memory_report), using_cassette(cassette):
+        return suggest_fixes(args)
+
+
+def suggest_fixes(args: argparse.Namespace) -> int:
     root = args.root
     if not root.is_absolute():
         root = (Path.cwd() / root).resolve()
 
+    streaming = args.input is not None and str(args.input) == "-"
     input_path = args.input
     if input_path is None:
         input_path = root / "failures.json"
-    elif not input_path.is_absolute():
+    elif not streaming and not input_path.is_absolute():
         input_path = (root / input_path).resolve()
 
-    if not input_path.exists():
+    if not streaming and not input_path.exists():
         print(f"Input JSON not found: {input_path}", file=sys.stderr)
         return 1
 
@@ -584,11 +706,21 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     elif not output_path.is_absolute():
         output_path = (root / output_path).resolve()
 
-    records = load_results(input_path, root)
-    records = filter_records(records, args.managers, args.package_ids)
-    if not records:
-        print("No failing entries matched the provided filters.")
-        return 0
+    # Streamed records are handled as they arrive so a pipeline from
+    # check_package_availability.py --format jsonl starts searching early.
+    records: Iterable[ResultRecord]
+    if streaming:
+        records = (record for record in iter_result_lines(sys.stdin, root)
+                   if record_matches(record, args.managers, args.package_ids))
+    else:
+        with phase("load"):
+            records = load_results(input_path, root)
+            records = filter_records(records, args.managers,
+                                     args.package_ids)
+        memory_checkpoint("load")
+        if not records:
+            print("No failing entries matched the provided filters.")
+            return 0
 
     search_managers = resolve_search_managers(args.search_managers)
 
@@ -596,21 +728,31 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     for record in records:
         suggestions, notes = search_for_record(record, search_managers,
                                                args.timeout)
-        if not args.no_stdout:
-            render_record(record, suggestions, notes, args.max_suggestions)
-        output_payload.append(
-            build_output_record(record, suggestions, notes,
-                                args.max_suggestions))
+        with phase("render"):
+            if not args.no_stdout:
+                render_record(record, suggestions, notes,
+                              args.max_suggestions)
+            output_payload.append(
+                build_output_record(record, suggestions, notes,
+                                    args.max_suggestions))
+
+    memory_checkpoint("searching")
+
+    if streaming and not output_payload:
+        print("No failing entries matched the provided filters.")
+        return 0
 
     try:
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(
-            json.dumps(output_payload, indent=2) + "\n",
-            encoding="utf-8",
-        )
+        with phase("render"):
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            output_path.write_text(
+                json.dumps(output_payload, indent=2) + "\n",
+                encoding="utf-8",
+            )
     except OSError as exc:
         print(f"Failed to write output JSON: {exc}", file=sys.stderr)
         return 1
+    memory_checkpoint("rendering")
 
     if args.no_stdout:
         print(